@@ -1,20 +1,31 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g
 from decimal import Decimal
 from src.ledger import Ledger, Posting
 from src.merkle import hex_root
 from src.routing import GraphRouter
 from src.segment_tree import SegmentTree
 from src.fraud_graph import DSU
-from src.atm_dp import min_notes
+from src.atm_dp import min_notes_fast
+from src.atm_fleet import ATMFleet
+from src.metrics import REGISTRY as metrics
+from src.importer import import_stream, detect_format
+from src.search_index import TransactionIndex
+from src.events import EventBroker
+from src.fx import FXBook, RateTable
+from src.snapshot import Deferred
+from src.analytics import LedgerColumns, REPORTS, run_report
+from src.verify import verify_ledger
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import random
 import json
 import csv
-from io import StringIO
-from flask import make_response
+from io import StringIO, TextIOWrapper
+from flask import make_response, Response
 import os
 import secrets
+import threading
+import time
 
 app = Flask(__name__)
 # Security: Use environment variable for secret key, generate random for dev
@@ -25,6 +36,31 @@ app.config['SESSION_COOKIE_SECURE'] = os.environ.get('FLASK_ENV') == 'production
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
+# Operator endpoints need this token in the X-Admin-Token header (disabled when unset)
+app.config['ADMIN_TOKEN'] = os.environ.get('ALGOBANK_ADMIN_TOKEN')
+
+def is_admin():
+    token = app.config.get('ADMIN_TOKEN')
+    return bool(token) and secrets.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+
+# Metrics: per-route latency histogram (registered first so it times every hook)
+route_latency = metrics.histogram('algobank_http_request_duration_seconds',
+                                  'HTTP request latency in seconds by route, method and status.')
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.metrics_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        route_latency.observe(time.perf_counter() - start,
+                              route=route, method=request.method, status=str(response.status_code))
+    return response
+
 # Security: Enforce HTTPS - Redirect HTTP to HTTPS
 @app.before_request
 def force_https():
@@ -57,9 +93,48 @@ def set_security_headers(response):
 
 # Global instances
 ledger = Ledger()
-fraud_detector = DSU()
-router = GraphRouter()
-interest_tree = SegmentTree(100)  # Support up to 100 days
+txn_index = TransactionIndex(ledger)  # kept current by Ledger.post via its listener hook
+fx_book = FXBook(ledger)  # columnar holdings for vectorized FX revaluation
+analytics = LedgerColumns(ledger)  # columnar journal export, synced on each report
+# Demo rate table: units of each currency per 1 EUR (load real ones with RateTable.load)
+fx_rates = RateTable('EUR', {'USD': Decimal('1.08'), 'GBP': Decimal('0.85'), 'CHF': Decimal('0.95'),
+                             'JPY': Decimal('162.0'), 'INR': Decimal('90.0')})
+
+# Engines are loaded from snapshots (or built) on first use, keeping startup fast
+SNAPSHOT_DIR = os.environ.get('ALGOBANK_SNAPSHOT_DIR', 'snapshots')
+
+def _snapshot_path(name):
+    path = os.path.join(SNAPSHOT_DIR, name)
+    return path if os.path.exists(path) else None
+
+def build_fraud_detector():
+    path = _snapshot_path('fraud.snap')
+    dsu = DSU.load(path) if path else DSU()
+    for acc_id in demo_accounts.values():
+        dsu.add(acc_id)
+    return dsu
+
+def build_router():
+    path = _snapshot_path('router.snap')
+    if path:
+        return GraphRouter.load(path)
+    # Initialize routing graph
+    graph = GraphRouter()
+    graph.add_edge("BankA", "BankB", 3)
+    graph.add_edge("BankB", "BankC", 2)
+    graph.add_edge("BankA", "BankC", 10)
+    graph.add_edge("BankC", "BankD", 1)
+    return graph
+
+def build_interest_tree():
+    path = _snapshot_path('interest.snap')
+    return SegmentTree.load(path) if path else SegmentTree(100)  # Support up to 100 days
+
+fraud_detector = Deferred(build_fraud_detector)
+router = Deferred(build_router)
+interest_tree = Deferred(build_interest_tree)
+atm_fleet = ATMFleet()
+atm_fleet.add_atm("ATM-001", [10, 10, 10, 10, 10, 10])
 
 # Create system account for initial deposits (double-entry requirement)
 system_account = ledger.create_account()
@@ -67,6 +142,9 @@ system_account = ledger.create_account()
 # Initialize demo accounts with realistic account numbers
 demo_accounts = {}
 account_names = {}
+
+# Server-push updates: Ledger.post notifies the broker, which fans out per account
+events = EventBroker(ledger, names=account_names)
 for i in range(3):
     acc_id = ledger.create_account()
     # Format as realistic account number (12 digits)
@@ -76,27 +154,29 @@ for i in range(3):
     # Set initial balance to 50,000 EUR for new users
     initial_balance = Decimal("50000")
     # Create an initial deposit transaction - must sum to zero
-    try:
-        ledger.post([
-            Posting(system_account, Decimal("-1") * initial_balance),
-            Posting(acc_id, initial_balance)
-        ], metadata={'desc': 'Initial Deposit', 'timestamp': datetime.now().isoformat()})
-    except Exception as e:
-        # If posting fails, manually set balance (for demo purposes)
-        ledger.caccounts[acc_id] = initial_balance
-    fraud_detector.add(acc_id)
+    ledger.post([
+        Posting(system_account, Decimal("-1") * initial_balance),
+        Posting(acc_id, initial_balance)
+    ], metadata={'desc': 'Initial Deposit', 'category': 'deposit', 'timestamp': datetime.now().isoformat()})
 
-# Initialize routing graph
-router.add_edge("BankA", "BankB", 3)
-router.add_edge("BankB", "BankC", 2)
-router.add_edge("BankA", "BankC", 10)
-router.add_edge("BankC", "BankD", 1)
+# Gauges are read at scrape time, so they cost nothing between scrapes
+metrics.gauge('algobank_ledger_entries', 'Number of journal entries in the ledger.', lambda: len(ledger.centries))
+metrics.gauge('algobank_ledger_accounts', 'Number of ledger accounts.', lambda: len(ledger.caccounts))
+metrics.gauge('algobank_fraud_clusters', 'Number of disjoint account clusters in the fraud DSU.',
+              lambda: fraud_detector.cluster_count())
 
 @app.route('/test')
 def test():
     """Simple test route to verify server is working"""
     return "<h1>Server is working! <a href='/login'>Go to Login</a></h1>"
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    if not metrics.enabled:
+        return 'metrics disabled\n', 404, {'Content-Type': 'text/plain'}
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
 @app.route('/favicon.ico')
 def favicon():
     """Serve favicon"""
@@ -137,13 +217,10 @@ def login():
                 
                 # Set initial balance to 50,000 EUR
                 initial_balance = Decimal("50000")
-                try:
-                    ledger.post([
-                        Posting(system_account, Decimal("-1") * initial_balance),
-                        Posting(acc_id, initial_balance)
-                    ], metadata={'desc': 'Welcome Bonus - Initial Deposit', 'timestamp': datetime.now().isoformat()})
-                except Exception as e:
-                    ledger.caccounts[acc_id] = initial_balance
+                ledger.post([
+                    Posting(system_account, Decimal("-1") * initial_balance),
+                    Posting(acc_id, initial_balance)
+                ], metadata={'desc': 'Welcome Bonus - Initial Deposit', 'category': 'deposit', 'timestamp': datetime.now().isoformat()})
                 fraud_detector.add(acc_id)
             
             session['account_id'] = demo_accounts[user_account_key]
@@ -170,42 +247,29 @@ def dashboard():
     if account_id and account_id not in ledger.caccounts:
         # Account doesn't exist, create new one with 50,000 EUR
         initial_balance = Decimal("50000")
-        try:
-            ledger.post([
-                Posting(system_account, Decimal("-1") * initial_balance),
-                Posting(account_id, initial_balance)
-            ], metadata={'desc': 'Welcome Bonus - Initial Deposit', 'timestamp': datetime.now().isoformat()})
-        except Exception as e:
-            ledger.caccounts[account_id] = initial_balance
+        ledger.open_account(account_id)
+        ledger.post([
+            Posting(system_account, Decimal("-1") * initial_balance),
+            Posting(account_id, initial_balance)
+        ], metadata={'desc': 'Welcome Bonus - Initial Deposit', 'category': 'deposit', 'timestamp': datetime.now().isoformat()})
         if account_id not in account_names:
             formatted_id = account_id.replace('-', '')[:12].upper()
             account_names[account_id] = f"Checking Account ****{formatted_id[-4:]}"
     
-    # Get balance safely
-    try:
-        balance = ledger.balance(account_id) if account_id else Decimal("0")
-    except KeyError:
-        balance = Decimal("0")
-        if account_id:
-            ledger.caccounts[account_id] = Decimal("50000")
-            balance = Decimal("50000")
+    balance = ledger.balance(account_id) if account_id else Decimal("0")
     
     # Format account number for display
     account_number = account_id[:8] if account_id else "00000000"
     account_display = account_names.get(account_id, f"Account ****{account_number[-4:]}")
     
-    # Get all account balances for display
-    all_accounts = ledger.all_accounts()
-    
     # Get recent transactions count
-    recent_count = len([e for e in ledger.centries if account_id and any(p.account_id == account_id for p in e.postings)])
+    recent_count = txn_index.count_for(account_id) if account_id else 0
     
     return render_template('dashboard.html', 
                          balance=balance, 
                          account_id=account_id,
                          account_display=account_display,
                          account_number=account_number,
-                         accounts=all_accounts,
                          transaction_count=recent_count)
 
 @app.route('/api/balance')
@@ -217,6 +281,118 @@ def api_balance():
     balance = ledger.balance(account_id)
     return jsonify({'balance': str(balance), 'account_id': account_id[:8]})
 
+@app.route('/api/accounts')
+def api_accounts():
+    """Balance-ranked account listing with cursor pagination (no full-table copy); operators only"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        min_bal = request.args.get('min')
+        max_bal = request.args.get('max')
+        min_bal = Decimal(min_bal) if min_bal else None
+        max_bal = Decimal(max_bal) if max_bal else None
+        cursor = request.args.get('cursor')
+        after = None
+        if cursor:
+            bal, acc = cursor.split(':', 1)
+            after = (Decimal(bal), acc)
+        if any(v is not None and not v.is_finite() for v in (min_bal, max_bal, after and after[0])):
+            raise ValueError('non-finite balance')
+    except (ValueError, ArithmeticError):
+        return jsonify({'error': 'Invalid query parameters'}), 400
+    descending = request.args.get('order', 'desc') != 'asc'
+    
+    index = ledger.cbalance_index
+    if min_bal is not None or max_bal is not None:
+        # Balance-range queries are always served in ascending order
+        rows = index.balance_range(min_bal, max_bal, limit=limit, after=after)
+    else:
+        rows = index.page(limit, after=after, descending=descending)
+    
+    accounts = [{
+        'account_id': acc,
+        'name': account_names.get(acc, f"Account ****{acc[-4:]}"),
+        'balance': str(bal),
+    } for acc, bal in rows]
+    next_cursor = f"{rows[-1][1]}:{rows[-1][0]}" if len(rows) == limit else None
+    return jsonify({'accounts': accounts, 'next_cursor': next_cursor, 'total': len(index)})
+
+@app.route('/api/fx/revaluation')
+def api_fx_revaluation():
+    """Revalue every account's holdings into a reporting currency in one vectorized pass"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    reporting = request.args.get('currency', ledger.BASE_CURRENCY)
+    if reporting not in fx_rates.crates:
+        return jsonify({'error': 'Unsupported currency'}), 400
+    
+    account_id = session.get('account_id')
+    start = time.perf_counter()
+    totals = fx_book.revalue(fx_rates, reporting)
+    elapsed = time.perf_counter() - start
+    holdings = ledger.holdings(account_id) if account_id in ledger.caccounts else {}
+    
+    result = {
+        'reporting_currency': reporting,
+        'account': {
+            'holdings': {c: str(v) for c, v in holdings.items()},
+            'total': round(fx_book.account_total(fx_rates, reporting, account_id), 2),
+            'unrated': sorted(c for c in holdings if c not in fx_rates.crates),
+        },
+        'elapsed_ms': round(elapsed * 1000, 3),
+    }
+    if is_admin():
+        # Bank-wide figures are operator-only; unrated currencies are left out of the totals
+        result.update({
+            'accounts': len(totals),
+            'bank_total': round(float(totals.sum()), 2),
+            'exposure': {c: round(v, 2) for c, v in fx_book.exposure().items()},
+            'unrated': fx_book.unrated(fx_rates),
+        })
+    return jsonify(result)
+
+@app.route('/api/analytics/<report>')
+def api_analytics(report):
+    """Bank-wide aggregates: daily volume, per-account net flow, top counterparty pairs, categories; operators only"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    if report not in REPORTS:
+        return jsonify({'error': 'Unknown report'}), 404
+    
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+        limit = min(int(request.args.get('limit', 100)), 1000)
+    except ValueError:
+        return jsonify({'error': 'Invalid date or limit'}), 400
+    currency = request.args.get('currency', ledger.BASE_CURRENCY)
+    
+    t0 = time.perf_counter()
+    rows = run_report(analytics, report, currency, start, end, limit)
+    elapsed = time.perf_counter() - t0
+    for row in rows:
+        for key in ('account_id', 'from', 'to'):
+            if key in row:
+                row[f'{key}_name'] = account_names.get(row[key], f"Account ****{row[key][-4:]}")
+        for key in ('volume', 'inflow', 'outflow', 'net'):
+            if key in row:
+                row[key] = round(row[key], 2)
+    
+    return jsonify({
+        'report': report,
+        'currency': currency,
+        'rows': rows,
+        'postings': analytics.csize,
+        'elapsed_ms': round(elapsed * 1000, 3),
+    })
+
 @app.route('/api/transfer', methods=['POST'])
 def api_transfer():
     if 'account_id' not in session:
@@ -235,17 +411,21 @@ def api_transfer():
     
     try:
         amount = Decimal(str(data.get('amount', 0)))
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, ArithmeticError):
         return jsonify({'error': 'Invalid amount format'}), 400
     
-    if amount <= 0:
+    if not amount.is_finite() or amount <= 0:
         return jsonify({'error': 'Invalid amount'}), 400
     
+    currency = data.get('currency', ledger.BASE_CURRENCY)
+    if not isinstance(currency, str) or currency not in fx_rates.crates:
+        return jsonify({'error': 'Unsupported currency'}), 400
+    
     try:
         # Check if recipient exists (for demo, use first available account if not found)
-        if to_account not in ledger.all_accounts():
+        if to_account not in ledger.caccounts:
             # Create account if doesn't exist
-            ledger.caccounts[to_account] = Decimal("0")
+            ledger.open_account(to_account)
             fraud_detector.add(to_account)
             account_names[to_account] = f"Account ****{to_account[-4:]}"
         
@@ -253,10 +433,11 @@ def api_transfer():
         recipient_name = account_names.get(to_account, f"Account ****{to_account[-4:]}")
         
         ledger.post([
-            Posting(from_account, -amount),
-            Posting(to_account, amount)
+            Posting(from_account, -amount, currency),
+            Posting(to_account, amount, currency)
         ], metadata={
             'desc': f'Transfer to {recipient_name}',
+            'category': 'transfer',
             'from': from_account,
             'to': to_account,
             'timestamp': datetime.now().isoformat()
@@ -264,23 +445,85 @@ def api_transfer():
         
         return jsonify({
             'success': True, 
-            'message': f'Transfer of €{amount:,.2f} to {recipient_name} completed successfully'
+            'message': (f'Transfer of €{amount:,.2f}' if currency == 'EUR' else f'Transfer of {amount:,.2f} {currency}')
+                       + f' to {recipient_name} completed successfully'
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/import', methods=['POST'])
+def api_import():
+    """Stream a CSV/NDJSON upload (multipart 'file' or raw body) into the ledger in chunks; operators only"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    upload = request.files.get('file')
+    if upload:
+        stream, filename = upload.stream, upload.filename or ''
+    else:
+        stream, filename = request.stream, ''
+    fmt = request.args.get('format') or detect_format(filename)
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': 'Unsupported format'}), 400
+    try:
+        chunk_size = min(max(int(request.args.get('chunk_size', 10000)), 1), 100000)
+    except ValueError:
+        return jsonify({'error': 'Invalid chunk_size'}), 400
+    
+    # Entries may touch the caller's account and accounts this import opens, never other customers'.
+    # An account opened by this import has its first journal entry at or after `start`.
+    caller = session.get('account_id')
+    start = len(ledger.centries)
+
+    def allow_account(acc_id):
+        if acc_id == caller or acc_id not in ledger.caccounts:
+            return True
+        first = txn_index.first_entry(acc_id)
+        return first is not None and first >= start
+
+    def register(acc_ids):
+        for acc_id in acc_ids:
+            fraud_detector.add(acc_id)
+    
+    # Decode lazily so only one chunk of rows is ever held in memory
+    text = TextIOWrapper(stream, encoding='utf-8', newline='')
+    stats = import_stream(ledger, text, fmt, chunk_size, allow_account=allow_account,
+                          allow_currency=lambda c: c in fx_rates.crates, on_open=register)
+    if stats.error:
+        return jsonify(stats.as_dict()), 400
+    return jsonify(stats.as_dict())
+
 @app.route('/api/transactions')
 def api_transactions():
     if 'account_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
     account_id = session.get('account_id')
+    try:
+        min_amount = Decimal(request.args['min']) if request.args.get('min') else None
+        max_amount = Decimal(request.args['max']) if request.args.get('max') else None
+        if any(v is not None and not v.is_finite() for v in (min_amount, max_amount)):
+            raise ArithmeticError('non-finite amount')
+    except ArithmeticError:
+        return jsonify({'error': 'Invalid amount filter'}), 400
+    
+    # Intersect index posting lists instead of scanning the whole journal
+    matches = txn_index.search(account_id,
+                               q=request.args.get('q', ''),
+                               min_amount=min_amount,
+                               max_amount=max_amount,
+                               counterparty=request.args.get('counterparty') or None)
     transactions = []
     
     # Generate timestamps (for demo, use entry index to create realistic dates)
     base_date = datetime.now()
+    last = len(ledger.centries) - 1
     
-    for idx, entry in enumerate(reversed(ledger.centries)):
+    for seq in reversed(matches):
+        entry = ledger.centries[seq]
+        idx = last - seq
         for posting in entry.postings:
             if posting.account_id == account_id:
                 # Create realistic timestamp (more recent first)
@@ -300,6 +543,7 @@ def api_transactions():
                 transactions.append({
                     'id': entry.entry_id[:8],
                     'amount': str(amount),
+                    'currency': posting.currency,
                     'description': desc,
                     'counterparty': counterparty or 'External',
                     'date': tx_date.strftime('%Y-%m-%d'),
@@ -314,6 +558,29 @@ def api_transactions():
     
     return jsonify({'transactions': transactions})
 
+@app.route('/api/events')
+def api_events():
+    """Server-sent events: incremental posting/balance updates for the session's account"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    account_id = session.get('account_id')
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    sub = events.subscribe(account_id, last_id)
+    
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                frame = sub.get(timeout=15)
+                # Comment lines keep idle connections alive through proxies
+                yield frame if frame is not None else ': keep-alive\n\n'
+        finally:
+            events.unsubscribe(sub)
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/transactions')
 def transactions_page():
     if 'user_id' not in session:
@@ -328,12 +595,23 @@ def atm_page():
 
 @app.route('/api/atm', methods=['POST'])
 def api_atm():
-    data = request.json
-    amount = int(data.get('amount', 0))
-    notes = [500, 200, 100, 50, 20, 10]
-    counts = [10, 10, 10, 10, 10, 10]  # Available counts
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Invalid request data'}), 400
+    try:
+        amount = int(data.get('amount', 0))
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({'error': 'Invalid amount'}), 400
+    atm_id = data.get('atm_id', 'ATM-001')
+    if not isinstance(atm_id, str) or atm_id not in atm_fleet.cinventory:
+        return jsonify({'error': 'ATM not found'}), 400
+    notes = atm_fleet.cnotes
+    counts = atm_fleet.cinventory[atm_id]  # Available counts
     
-    result = min_notes(amount, notes, counts)
+    try:
+        result = min_notes_fast(amount, notes, counts)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     return jsonify({
         'amount': amount,
         'min_notes': result,
@@ -408,13 +686,16 @@ def api_statement():
     account_id = session.get('account_id')
     month = data.get('month')
     year = data.get('year')
+    currency = data.get('currency') or ledger.BASE_CURRENCY
+    if not isinstance(currency, str) or currency not in fx_rates.crates:
+        return jsonify({'error': 'Unsupported currency'}), 400
     
     transactions = []
     base_date = datetime.now()
     
     for idx, entry in enumerate(reversed(ledger.centries)):
         for posting in entry.postings:
-            if posting.account_id == account_id:
+            if posting.account_id == account_id and posting.currency == currency:
                 tx_date = (base_date - timedelta(days=idx * 2))
                 if month and tx_date.month != int(month):
                     continue
@@ -432,10 +713,10 @@ def api_statement():
                     'counterparty': counterparty or 'External',
                     'debit': str(abs(posting.amount)) if posting.amount < 0 else '',
                     'credit': str(posting.amount) if posting.amount > 0 else '',
-                    'balance': str(ledger.balance(account_id))
+                    'balance': str(ledger.balance(account_id, currency))
                 })
     
-    return jsonify({'transactions': transactions})
+    return jsonify({'transactions': transactions, 'currency': currency})
 
 @app.route('/api/statement/download')
 def download_statement():
@@ -445,6 +726,9 @@ def download_statement():
     account_id = session.get('account_id')
     month = request.args.get('month')
     year = request.args.get('year')
+    currency = request.args.get('currency') or ledger.BASE_CURRENCY
+    if currency not in fx_rates.crates:
+        return jsonify({'error': 'Unsupported currency'}), 400
     
     # Generate CSV
     output = StringIO()
@@ -456,7 +740,7 @@ def download_statement():
     base_date = datetime.now()
     for idx, entry in enumerate(reversed(ledger.centries)):
         for posting in entry.postings:
-            if posting.account_id == account_id:
+            if posting.account_id == account_id and posting.currency == currency:
                 tx_date = (base_date - timedelta(days=idx * 2))
                 if month and tx_date.month != int(month):
                     continue
@@ -474,11 +758,12 @@ def download_statement():
                     counterparty or 'External',
                     abs(posting.amount) if posting.amount < 0 else '',
                     posting.amount if posting.amount > 0 else '',
-                    ledger.balance(account_id)
+                    ledger.balance(account_id, currency)
                 ])
     
     response = make_response(output.getvalue())
-    filename = f"statement_{year or 'all'}_{month or 'all'}.csv"
+    suffix = '' if currency == ledger.BASE_CURRENCY else f"_{currency}"
+    filename = f"statement_{year or 'all'}_{month or 'all'}{suffix}.csv"
     response.headers['Content-Disposition'] = f'attachment; filename={filename}'
     response.headers['Content-type'] = 'text/csv'
     return response
@@ -530,7 +815,7 @@ def api_recharge():
         ledger.post([
             Posting(account_id, -amount),
             Posting(system_account, amount)
-        ], metadata={'desc': f'Mobile Recharge - {phone}', 'timestamp': datetime.now().isoformat()})
+        ], metadata={'desc': f'Mobile Recharge - {phone}', 'category': 'recharge', 'timestamp': datetime.now().isoformat()})
         return jsonify({'success': True, 'message': f'Recharge of €{amount} successful'})
     except:
         return jsonify({'error': 'Transaction failed'}), 400
@@ -549,7 +834,7 @@ def api_billpay():
         ledger.post([
             Posting(account_id, -amount),
             Posting(system_account, amount)
-        ], metadata={'desc': f'Bill Payment - {biller}', 'timestamp': datetime.now().isoformat()})
+        ], metadata={'desc': f'Bill Payment - {biller}', 'category': 'bills', 'timestamp': datetime.now().isoformat()})
         return jsonify({'success': True, 'message': f'Bill payment of €{amount} successful'})
     except:
         return jsonify({'error': 'Payment failed'}), 400
@@ -620,6 +905,51 @@ def profile_page():
     
     return render_template('profile.html', user_data=user_data)
 
+# ===== Operator Routes =====
+snapshot_lock = threading.Lock()  # saves share a temp file per snapshot
+
+@app.route('/api/admin/snapshots', methods=['POST'])
+def api_save_snapshots():
+    """Write this process's router, fraud DSU and interest tree to ALGOBANK_SNAPSHOT_DIR; operators only"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    start = time.perf_counter()
+    with snapshot_lock:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        router.save(os.path.join(SNAPSHOT_DIR, 'router.snap'))
+        fraud_detector.save(os.path.join(SNAPSHOT_DIR, 'fraud.snap'))
+        interest_tree.save(os.path.join(SNAPSHOT_DIR, 'interest.snap'))
+    return jsonify({
+        'directory': SNAPSHOT_DIR,
+        'snapshots': ['router.snap', 'fraud.snap', 'interest.snap'],
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+    })
+
+@app.route('/api/admin/verify')
+def api_verify_ledger():
+    """Check this process's stored balances and entry balancing against its journal; operators only"""
+    if 'account_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    # In-process: forking verifier workers from a threaded server is unsafe
+    report = verify_ledger(ledger, workers=1)
+    return jsonify({
+        'ok': report.ok,
+        'entries': report.entries,
+        'accounts': report.accounts,
+        'merkle_root': report.merkle_root,
+        'mismatches': [{'account_id': m.account_id, 'currency': m.currency,
+                        'stored': str(m.stored), 'journal': str(m.journal)} for m in report.mismatches[:100]],
+        'unbalanced': [{'seq': u.seq, 'entry_id': u.entry_id,
+                        'totals': {c: str(t) for c, t in u.totals.items()}} for u in report.unbalanced[:100]],
+        'elapsed_ms': round(report.elapsed * 1000, 3),
+    })
+
 if __name__ == '__main__':
     import os
     # Production-ready configuration
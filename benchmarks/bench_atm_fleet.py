@@ -0,0 +1,51 @@
+"""
+Replenishment-sizing benchmark: replay a synthetic day of withdrawals across
+a fleet of ATMs and report withdrawals/sec.
+
+    python -m benchmarks.bench_atm_fleet --atms 1000 --withdrawals 100000
+"""
+import argparse
+import random
+import time
+
+from src.atm_fleet import ATMFleet
+
+
+def make_fleet(n_atms: int, seed: int = 0) -> ATMFleet:
+    rng = random.Random(seed)
+    fleet = ATMFleet()
+    for i in range(n_atms):
+        fleet.add_atm(f"ATM-{i:05d}", [rng.randint(20, 200) for _ in fleet.cnotes])
+    return fleet
+
+
+def make_withdrawals(n_atms: int, n: int, seed: int = 0):
+    rng = random.Random(seed + 1)
+    amounts = [20, 40, 50, 60, 80, 100, 150, 200, 250, 300, 400, 500, 750, 1000]
+    return [(f"ATM-{rng.randrange(n_atms):05d}", rng.choice(amounts)) for _ in range(n)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--atms", type=int, default=1000)
+    ap.add_argument("--withdrawals", type=int, default=100_000)
+    ap.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    fleet = make_fleet(args.atms, args.seed)
+    stream = make_withdrawals(args.atms, args.withdrawals, args.seed)
+
+    t0 = time.perf_counter()
+    results = fleet.replay(stream, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    accepted = sum(r is not None for r in results)
+    print(f"{args.atms} ATMs x {args.withdrawals} withdrawals: "
+          f"{accepted} accepted, {len(results) - accepted} rejected")
+    print(f"{elapsed:.2f}s  ->  {len(results) / elapsed:,.0f} withdrawals/sec")
+    return {"elapsed_s": elapsed, "withdrawals_per_sec": len(results) / elapsed, "accepted": accepted}
+
+
+if __name__ == "__main__":
+    main()
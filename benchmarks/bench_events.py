@@ -0,0 +1,79 @@
+"""
+Server-push benchmark: idle memory per subscriber and fan-out latency from
+Ledger.post to every connected subscriber of an account.
+
+    python -m benchmarks.bench_events --subscribers 5000 --listeners 500
+"""
+import argparse
+import threading
+import time
+import tracemalloc
+from decimal import Decimal
+
+from src.events import EventBroker
+from src.ledger import Ledger, Posting
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--subscribers", type=int, default=5000, help="subscriptions on the hot account")
+    ap.add_argument("--listeners", type=int, default=500,
+                    help="subscribers with a blocked consumer thread (like SSE request threads)")
+    ap.add_argument("--posts", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    led = Ledger()
+    hot, other = led.open_account("hot"), led.open_account("other")
+    broker = EventBroker(led)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subs = [broker.subscribe(hot) for _ in range(args.subscribers)]
+    idle_bytes = (tracemalloc.get_traced_memory()[0] - before) / len(subs)
+    tracemalloc.stop()
+
+    # Consumer threads block in get() exactly as the /api/events generator does
+    received = []
+    lock = threading.Lock()
+
+    def listen(sub, n):
+        for _ in range(n):
+            sub.get()
+            with lock:
+                received.append(time.perf_counter())
+
+    threads = [threading.Thread(target=listen, args=(s, 2 * args.posts), daemon=True)
+               for s in subs[:args.listeners]]
+    for t in threads:
+        t.start()
+
+    post_lat, deliver_lat = [], []
+    for _ in range(args.posts):
+        received.clear()
+        t0 = time.perf_counter()
+        led.post([Posting(hot, Decimal("-1")), Posting(other, Decimal("1"))], {"desc": "Transfer"})
+        post_lat.append(time.perf_counter() - t0)
+        while True:
+            with lock:
+                if len(received) >= 2 * len(threads):
+                    deliver_lat.append(max(received) - t0)
+                    break
+            time.sleep(0.0005)
+    for s in subs[args.listeners:]:
+        while s.get(timeout=0) is not None:
+            pass
+
+    post_lat.sort()
+    deliver_lat.sort()
+    print(f"idle memory per subscriber: {idle_bytes:,.0f} bytes ({args.subscribers:,} subscribers)")
+    print(f"post + fan-out to {args.subscribers:,} queues: p50 {post_lat[len(post_lat) // 2] * 1e3:.2f} ms, "
+          f"max {post_lat[-1] * 1e3:.2f} ms")
+    print(f"delivered to all {len(threads):,} blocked consumers: p50 {deliver_lat[len(deliver_lat) // 2] * 1e3:.2f} ms, "
+          f"max {deliver_lat[-1] * 1e3:.2f} ms")
+    return {"idle_bytes_per_subscriber": idle_bytes,
+            "post_p50_ms": post_lat[len(post_lat) // 2] * 1e3,
+            "deliver_p50_ms": deliver_lat[len(deliver_lat) // 2] * 1e3}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Month-end statement batch benchmark: one statement per account for a
+synthetic month, reporting total time and statements/sec.
+
+    python -m benchmarks.bench_statements --accounts 100000 --entries 300000
+"""
+import argparse
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.ledger import Ledger, Posting
+from src.statements import generate_statements
+
+
+def make_ledger(n_accounts: int, n_entries: int, seed: int = 0) -> Ledger:
+    rng = random.Random(seed)
+    led = Ledger()
+    accounts = [led.open_account(f"ACC{i:07d}") for i in range(n_accounts)]
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(n_entries):
+        a, b = rng.sample(accounts, 2)
+        amt = Decimal(rng.randint(1, 100_000)) / 100
+        when = start + timedelta(seconds=rng.randrange(60 * 86400))  # Jan-Feb 2024
+        batch.append((f"tx{i}", [Posting(a, -amt), Posting(b, amt)],
+                      {"desc": "Transfer", "timestamp": when.isoformat()}))
+        if len(batch) == 10_000:
+            led.post_many(batch)
+            batch = []
+    if batch:
+        led.post_many(batch)
+    return led
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--accounts", type=int, default=100_000)
+    ap.add_argument("--entries", type=int, default=300_000)
+    ap.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    ap.add_argument("--out", default=None, help="output directory (default: a temp dir, removed afterwards)")
+    args = ap.parse_args(argv)
+
+    led = make_ledger(args.accounts, args.entries)
+    out = args.out or tempfile.mkdtemp(prefix="algobank-statements-")
+    try:
+        run = generate_statements(led, 2024, 2, out, workers=args.workers)
+    finally:
+        if args.out is None:
+            shutil.rmtree(out, ignore_errors=True)
+    print(f"{run.statements:,} statements ({run.rows:,} rows) in {run.elapsed:.2f}s "
+          f"-> {run.per_sec:,.0f} statements/sec")
+    return {"elapsed_s": run.elapsed, "statements_per_sec": run.per_sec}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare base.json new.json --threshold 0.10
+
+Exits with status 1 if any benchmark's throughput dropped, or its p99
+latency grew, by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as fh:
+        return {(r["name"], r["scale"]): r for r in json.load(fh)["results"]}
+
+
+def compare(base, new, threshold):
+    """Return (rows, regressions); each row is (key, throughput ratio, p99 ratio, flagged)."""
+    rows, regressions = [], []
+    for key in sorted(base.keys() & new.keys()):
+        b, n = base[key], new[key]
+        tput = n["ops_per_sec"] / b["ops_per_sec"] if b["ops_per_sec"] else 1.0
+        p99 = n["p99_us"] / b["p99_us"] if b["p99_us"] else 1.0
+        flagged = tput < 1 - threshold or p99 > 1 + threshold
+        rows.append((key, tput, p99, flagged))
+        if flagged:
+            regressions.append(key)
+    return rows, regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare two benchmark runs")
+    ap.add_argument("base")
+    ap.add_argument("new")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    args = ap.parse_args(argv)
+
+    base, new = load(args.base), load(args.new)
+    rows, regressions = compare(base, new, args.threshold)
+    print(f"{'benchmark':32} {'scale':>9} {'ops/s x':>9} {'p99 x':>8}")
+    for (name, scale), tput, p99, flagged in rows:
+        print(f"{name:32} {scale:>9} {tput:>9.2f} {p99:>8.2f}{'  REGRESSION' if flagged else ''}")
+    for key in sorted(base.keys() ^ new.keys()):
+        print(f"{key[0]:32} {key[1]:>9}  (only in {'base' if key in base else 'new'})")
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
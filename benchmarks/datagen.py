@@ -0,0 +1,74 @@
+"""Seeded synthetic data generators shared by the benchmarks."""
+import random
+from decimal import Decimal
+from typing import List, Tuple
+
+from src.ledger import Ledger, Posting
+from src.routing import GraphRouter
+
+BILLERS = ["Electricity", "Water", "Internet", "Gas", "Insurance", "Phone"]
+
+
+def make_ledger(n_accounts: int, n_entries: int, seed: int = 0) -> Tuple[Ledger, List[str]]:
+    """Ledger with n_accounts accounts and n_entries random two-leg transfers."""
+    rng = random.Random(seed)
+    led = Ledger()
+    accounts = [led.create_account() for _ in range(max(n_accounts, 2))]
+    for _ in range(n_entries):
+        a, b = rng.sample(accounts, 2)
+        amt = Decimal(rng.randint(1, 100_000)) / 100
+        led.post([Posting(a, -amt), Posting(b, amt)], metadata=random_metadata(rng))
+    return led, accounts
+
+
+def random_metadata(rng: random.Random) -> dict:
+    if rng.random() < 0.5:
+        return {"desc": f"Bill Payment - {rng.choice(BILLERS)}", "category": "bills"}
+    return {"desc": "Transfer", "category": "transfer"}
+
+
+def make_transfers(accounts: List[str], n: int, seed: int = 0) -> List[List[Posting]]:
+    """n balanced two-leg posting lists between random accounts."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        a, b = rng.sample(accounts, 2)
+        amt = Decimal(rng.randint(1, 100_000)) / 100
+        out.append([Posting(a, -amt), Posting(b, amt)])
+    return out
+
+
+def make_graph(n_nodes: int, avg_degree: int = 4, seed: int = 0) -> GraphRouter:
+    """Connected random bank graph: a spanning chain plus random extra edges."""
+    rng = random.Random(seed)
+    gr = GraphRouter()
+    nodes = [f"Bank{i}" for i in range(max(n_nodes, 2))]
+    for i in range(1, len(nodes)):
+        gr.add_edge(nodes[rng.randrange(i)], nodes[i], rng.randint(1, 20))
+    for _ in range(len(nodes) * (avg_degree // 2 - 1)):
+        gr.add_edge(rng.choice(nodes), rng.choice(nodes), rng.randint(1, 20))
+    return gr
+
+
+def make_leaves(n: int, seed: int = 0) -> List[bytes]:
+    rng = random.Random(seed)
+    return [f"tx{i}:{rng.randint(1, 10**6)}EUR".encode() for i in range(n)]
+
+
+def make_pairs(n_items: int, n_pairs: int, seed: int = 0) -> List[Tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(n_items), rng.randrange(n_items)) for _ in range(n_pairs)]
+
+
+def make_ranges(size: int, n: int, seed: int = 0) -> List[Tuple[int, int, int]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        l = rng.randrange(size)
+        out.append((l, rng.randrange(l, size), rng.randint(1, 5)))
+    return out
+
+
+def make_amounts(n: int, seed: int = 0) -> List[int]:
+    rng = random.Random(seed)
+    return [rng.randint(1, 500) * 10 for _ in range(n)]
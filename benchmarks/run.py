@@ -0,0 +1,260 @@
+"""
+Scaling benchmarks for every engine and the key Flask routes.
+
+    python -m benchmarks.run --scales 1k,100k,1M --out bench_results.json
+    python -m benchmarks.run --only ledger,http --scales 1k
+    python -m benchmarks.compare old.json bench_results.json
+
+Each benchmark reports throughput, p50/p99 per-operation latency and the
+peak traced memory of its setup plus operations (from a second, traced pass).
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks import datagen
+from src.atm_dp import min_notes_fast
+from src.fraud_graph import DSU
+from src.ledger import Ledger
+from src.merkle import merkle_root
+from src.segment_tree import SegmentTree
+
+
+def bench_ledger(n, seed):
+    led, accounts = datagen.make_ledger(min(n, 10_000), 0, seed)
+    yield "ledger.post", led.post, datagen.make_transfers(accounts, n, seed)
+
+
+def bench_merkle(n, seed):
+    leaves = datagen.make_leaves(n, seed)
+    yield "merkle.root", lambda _: merkle_root(leaves), range(5)
+
+
+def bench_routing(n, seed):
+    gr = datagen.make_graph(n, seed=seed)
+    # Each query is O(E log V) with path copying, so shrink the query count as the graph grows
+    pairs = datagen.make_pairs(n, max(5, min(200, 2_000_000 // n)), seed)
+    yield "routing.shortest_path", lambda p: gr.shortest_path(f"Bank{p[0]}", f"Bank{p[1]}"), pairs
+
+
+def bench_dsu(n, seed):
+    dsu = DSU()
+    for i in range(n):
+        dsu.add(i)
+    yield "dsu.union", lambda p: dsu.union(*p), datagen.make_pairs(n, n, seed)
+
+
+def bench_segment_tree(n, seed):
+    st = SegmentTree(n)
+
+    def op(r):
+        st.range_add(*r)
+        st.point_query(r[0])
+    yield "segment_tree.update_query", op, datagen.make_ranges(n, n, seed)
+
+
+def bench_atm(n, seed):
+    notes = [500, 200, 100, 50, 20, 10]
+    counts = [50] * len(notes)
+    yield "atm.min_notes_fast", lambda a: min_notes_fast(a, notes, counts), \
+        datagen.make_amounts(min(n, 100_000), seed)
+
+
+def bench_http(n, seed):
+    import app as webapp
+
+    # Point the app at a fresh journal of n entries so route cost tracks scale
+    led, accounts = datagen.make_ledger(min(n, 10_000), n, seed)
+    webapp.ledger = led
+    webapp.txn_index = webapp.TransactionIndex(led)
+    webapp.events = webapp.EventBroker(led, names=webapp.account_names)
+    webapp.fx_book = webapp.FXBook(led)
+    webapp.analytics = webapp.LedgerColumns(led)
+    webapp.system_account = accounts[0]
+    webapp.demo_accounts.clear()
+    client = webapp.app.test_client()
+    client.post("/login", data={"username": "bench", "password": "bench"})
+    rng = random.Random(seed)
+
+    def call(method, url, **kw):
+        resp = client.open(url, method=method, **kw)
+        if resp.status_code >= 400:
+            raise RuntimeError(f"{method} {url} -> {resp.status_code}")
+
+    k = min(n, 500)
+    yield "http.GET /api/balance", lambda _: call("GET", "/api/balance"), range(k)
+    yield "http.GET /api/transactions", lambda _: call("GET", "/api/transactions"), range(min(k, 50))
+    yield "http.POST /api/transfer", lambda a: call("POST", "/api/transfer", json={
+        "to_account": a, "amount": "1.00"}), [rng.choice(accounts) for _ in range(k)]
+    yield "http.POST /api/atm", lambda a: call("POST", "/api/atm", json={"amount": a}), \
+        datagen.make_amounts(k, seed)
+    yield "http.POST /api/routing", lambda _: call("POST", "/api/routing", json={
+        "start": "BankA", "end": "BankD"}), range(k)
+
+
+def bench_fx(n, seed):
+    import numpy as np
+    from src.fx import FXBook, RateTable
+
+    rates = RateTable("EUR", {"USD": "1.08", "GBP": "0.85", "CHF": "0.95", "JPY": "162", "INR": "90"})
+    book = FXBook(Ledger())
+    for i in range(n):
+        book._row(f"ACC{i}")
+    for c in rates.currencies():
+        book._col(c)
+    book.cmatrix[:n] = np.random.default_rng(seed).uniform(-1e4, 1e4, (n, book.cmatrix.shape[1]))
+    yield "fx.revalue", lambda _: book.revalue(rates, "USD"), range(10)
+
+
+def bench_analytics(n, seed):
+    import numpy as np
+    from src.analytics import LedgerColumns
+
+    # Journal export runs through Python objects, so keep its journal small
+    led, _ = datagen.make_ledger(min(n, 10_000), min(n, 50_000), seed)
+    yield "analytics.sync", lambda _: LedgerColumns(led).sync(), range(3)
+
+    # Reports run on n synthetic two-leg postings (n/2 transfers over a year)
+    rng = np.random.default_rng(seed)
+    cols = LedgerColumns(Ledger())
+    cols.cwatermark = len(cols.cledger.centries)
+    n_acc = max(2, min(n // 10, 1_000_000))
+    for i in range(n_acc):
+        cols._intern(cols.caccount_code, cols.caccount_ids, f"ACC{i}")
+    cols._intern(cols.ccurrency_code, cols.ccurrencies, "EUR")
+    for c in datagen.BILLERS:
+        cols._intern(cols.ccategory_code, cols.ccategories, c)
+    k = max(n // 2, 1)
+    pairs = rng.integers(0, n_acc, (k, 2))
+    amt = rng.uniform(1, 1000, k)
+    days = rng.integers(19_700, 20_065, k)
+    cols._append(entry=np.repeat(np.arange(k), 2), day=np.repeat(days, 2), account=pairs.ravel(),
+                 currency=np.zeros(2 * k), category=np.repeat(rng.integers(0, len(datagen.BILLERS), k), 2),
+                 amount=np.column_stack([-amt, amt]).ravel())
+    cols._append_flows(entry=np.arange(k), day=days, payer=pairs[:, 0], payee=pairs[:, 1],
+                       currency=np.zeros(k), amount=amt)
+    yield "analytics.daily", lambda _: cols.daily(), range(5)
+    yield "analytics.net_flows", lambda _: cols.net_flows(limit=100), range(5)
+    yield "analytics.top_pairs", lambda _: cols.top_pairs(limit=100), range(5)
+    yield "analytics.categories", lambda _: cols.categories(), range(5)
+
+
+def bench_verify(n, seed):
+    from src.verify import verify_ledger
+
+    led, _ = datagen.make_ledger(min(n, 10_000), n, seed)
+    yield "verify.ledger", lambda _: verify_ledger(led), range(3)
+
+
+BENCHES = {
+    "ledger": bench_ledger,
+    "merkle": bench_merkle,
+    "routing": bench_routing,
+    "dsu": bench_dsu,
+    "segment_tree": bench_segment_tree,
+    "atm": bench_atm,
+    "fx": bench_fx,
+    "analytics": bench_analytics,
+    "verify": bench_verify,
+    "http": bench_http,
+}
+
+
+def parse_scale(text: str) -> int:
+    mult = {"k": 1_000, "m": 1_000_000}.get(text[-1].lower(), 1)
+    return int(float(text[:-1] if mult > 1 else text) * mult)
+
+
+def _percentile(sorted_vals, q):
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * (len(sorted_vals) - 1) + 0.5))]
+
+
+def run_group(fn, n, seed):
+    """Timed pass: returns one result dict per benchmark in the group."""
+    results = []
+    for name, op, items in fn(n, seed):
+        lat = []
+        perf = time.perf_counter
+        start = perf()
+        for it in items:
+            t0 = perf()
+            op(it)
+            lat.append(perf() - t0)
+        total = perf() - start
+        lat.sort()
+        results.append({
+            "name": name,
+            "scale": n,
+            "ops": len(lat),
+            "seconds": total,
+            "ops_per_sec": len(lat) / total if total else float("inf"),
+            "p50_us": _percentile(lat, 0.50) * 1e6,
+            "p99_us": _percentile(lat, 0.99) * 1e6,
+        })
+    return results
+
+
+def trace_group(fn, n, seed):
+    """Traced pass: peak traced memory (MB) of each benchmark's setup and operations."""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for name, op, items in fn(n, seed):
+            for it in items:
+                op(it)
+            peaks[name] = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.reset_peak()
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AlgoBank scaling benchmarks")
+    ap.add_argument("--scales", default="1k", help="comma-separated sizes, e.g. 1k,100k,1M")
+    ap.add_argument("--only", default="", help=f"comma-separated groups from {sorted(BENCHES)}")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-memory", action="store_true", help="skip the traced memory pass")
+    ap.add_argument("--out", default="bench_results.json")
+    args = ap.parse_args(argv)
+
+    groups = [g for g in args.only.split(",") if g] or list(BENCHES)
+    unknown = set(groups) - set(BENCHES)
+    if unknown:
+        ap.error(f"unknown benchmark group(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"{'benchmark':32} {'scale':>9} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak MB':>9}")
+    for n in map(parse_scale, args.scales.split(",")):
+        for g in groups:
+            rows = run_group(BENCHES[g], n, args.seed)
+            peaks = {} if args.no_memory else trace_group(BENCHES[g], n, args.seed)
+            for r in rows:
+                r["peak_mem_mb"] = peaks.get(r["name"])
+                mem = f"{r['peak_mem_mb']:.1f}" if r["peak_mem_mb"] is not None else "-"
+                print(f"{r['name']:32} {n:>9} {r['ops_per_sec']:>12,.0f} "
+                      f"{r['p50_us']:>10.1f} {r['p99_us']:>10.1f} {mem:>9}")
+            results.extend(rows)
+
+    doc = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as fh:
+        json.dump(doc, fh, indent=2)
+    print(f"\nWrote {len(results)} results to {args.out}")
+    return doc
+
+
+if __name__ == "__main__":
+    main()
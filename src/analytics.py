@@ -0,0 +1,350 @@
+"""
+Vectorized ledger analytics.
+
+The journal is exported into columnar NumPy arrays (one row per posting),
+incrementally from a watermark into ledger.centries, and every report is a
+masked group-by over those columns: bincount over dense codes where the key
+space is small (days, accounts, categories) and a sort-based unique where it
+is not (counterparty pairs, from a second table of payer -> payee flows).
+
+    python -m src.analytics --from history.csv daily
+    python -m src.analytics --from history.csv pairs --limit 20
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.ledger import Ledger
+from src.metrics import timed
+
+UNCATEGORIZED = "uncategorized"
+_EPOCH = date(1970, 1, 1).toordinal()
+
+# name -> dtype of every per-posting column
+COLUMNS = {
+    "entry": np.int64,        # seq in ledger.centries
+    "day": np.int32,          # days since 1970-01-01
+    "account": np.int32,      # account code
+    "currency": np.int16,     # currency code
+    "category": np.int32,     # category code
+    "amount": np.float64,
+}
+
+# name -> dtype of every payer -> payee flow column (see split_flows)
+FLOW_COLUMNS = {
+    "entry": np.int64,
+    "day": np.int32,
+    "payer": np.int32,        # account code
+    "payee": np.int32,        # account code
+    "currency": np.int16,
+    "amount": np.float64,     # positive
+}
+
+
+def day_number(d: date) -> int:
+    return d.toordinal() - _EPOCH
+
+
+def day_date(n: int) -> date:
+    return date.fromordinal(int(n) + _EPOCH)
+
+
+def split_flows(legs: List[Tuple[int, int, float]]) -> List[Tuple[int, int, int, float]]:
+    """
+    (payer, payee, currency, amount) flows of one entry from its (account, currency,
+    amount) legs. Within a currency a single debit leg pays each credit leg its
+    amount, a single credit leg is paid by each debit leg, and otherwise every
+    debit is split across the credits pro rata. Self-flows are dropped.
+    """
+    by_currency: Dict[int, Tuple[list, list]] = {}
+    for acc, cur, amt in legs:
+        debits, credits = by_currency.setdefault(cur, ([], []))
+        if amt < 0:
+            debits.append((acc, -amt))
+        elif amt > 0:
+            credits.append((acc, amt))
+    out = []
+    for cur, (debits, credits) in by_currency.items():
+        if not debits or not credits:
+            continue
+        if len(debits) == 1:
+            flows = [(debits[0][0], acc, amt) for acc, amt in credits]
+        elif len(credits) == 1:
+            flows = [(acc, credits[0][0], amt) for acc, amt in debits]
+        else:
+            total = sum(amt for _, amt in credits)
+            flows = [(d, c, d_amt * c_amt / total) for d, d_amt in debits for c, c_amt in credits]
+        out.extend((payer, payee, cur, amt) for payer, payee, amt in flows if payer != payee)
+    return out
+
+
+class LedgerColumns:
+    """
+    Columnar export of the journal for reporting.
+    sync() appends the postings of every entry past cwatermark; reports call it
+    first, so they always cover the whole journal and only pay for new entries.
+    Accounts, currencies and categories are interned to dense integer codes.
+    Alongside the postings, cflows holds each entry's payer -> payee flows.
+    Entries are dated by their 'timestamp' metadata (the day they were exported
+    if they have none) and categorised by their 'category' metadata.
+    Amounts are floats, as in FXBook: exact balances stay in the ledger.
+    """
+
+    def __init__(self, ledger: Ledger, initial_capacity: int = 1024, chunk_size: int = 1 << 16):
+        self.cledger = ledger
+        self.cwatermark = 0
+        self.csize = 0
+        self.cchunk_size = chunk_size
+        self.ccols: Dict[str, np.ndarray] = {name: np.empty(initial_capacity, dtype=dt)
+                                             for name, dt in COLUMNS.items()}
+        self.cflow_size = 0
+        self.cflows: Dict[str, np.ndarray] = {name: np.empty(initial_capacity, dtype=dt)
+                                              for name, dt in FLOW_COLUMNS.items()}
+        self.caccount_code: Dict[str, int] = {}
+        self.caccount_ids: List[str] = []
+        self.ccurrency_code: Dict[str, int] = {}
+        self.ccurrencies: List[str] = []
+        self.ccategory_code: Dict[str, int] = {}
+        self.ccategories: List[str] = []
+        self.cdays: Dict[str, int] = {}
+        self.clock = threading.Lock()
+
+    @staticmethod
+    def _intern(codes: Dict[str, int], ids: List[str], key: str) -> int:
+        c = codes.get(key)
+        if c is None:
+            c = codes[key] = len(ids)
+            ids.append(key)
+        return c
+
+    def _day(self, ts: Optional[str], today: int) -> int:
+        if not ts:
+            return today
+        key = ts[:10]
+        d = self.cdays.get(key)
+        if d is None:
+            try:
+                d = day_number(date.fromisoformat(key))
+            except ValueError:
+                d = today
+            self.cdays[key] = d
+        return d
+
+    @staticmethod
+    def _extend(store: Dict[str, np.ndarray], n: int, cols) -> int:
+        """Append equal-length arrays to store's first n rows, growing by doubling; returns the new size."""
+        k = len(cols["amount"])
+        cap = len(store["amount"])
+        if n + k > cap:
+            cap = max(cap * 2, n + k)
+            for name, arr in store.items():
+                grown = np.empty(cap, dtype=arr.dtype)
+                grown[:n] = arr[:n]
+                store[name] = grown
+        for name, arr in store.items():
+            arr[n:n + k] = cols[name]
+        return n + k
+
+    def _append(self, **cols: np.ndarray):
+        """Append one array per posting column."""
+        self.csize = self._extend(self.ccols, self.csize, cols)
+
+    def _append_flows(self, **cols: np.ndarray):
+        """Append one array per flow column."""
+        self.cflow_size = self._extend(self.cflows, self.cflow_size, cols)
+
+    @timed("algobank_analytics_sync", "Latency of exporting new journal entries to columns in seconds.")
+    def sync(self) -> int:
+        """Export entries appended since the last sync; returns the number of new postings."""
+        with self.clock:
+            entries = self.cledger.centries
+            stop = len(entries)
+            added = 0
+            today = day_number(datetime.now().date())
+            acc_codes, acc_ids = self.caccount_code, self.caccount_ids
+            intern = self._intern
+            for lo in range(self.cwatermark, stop, self.cchunk_size):
+                hi = min(lo + self.cchunk_size, stop)
+                ent, day, acc, cur, cat, amt = [], [], [], [], [], []
+                f_ent, f_day, f_payer, f_payee, f_cur, f_amt = [], [], [], [], [], []
+                for seq in range(lo, hi):
+                    je = entries[seq]
+                    meta = je.metadata
+                    d = self._day(meta.get("timestamp"), today)
+                    g = intern(self.ccategory_code, self.ccategories, meta.get("category") or UNCATEGORIZED)
+                    legs = [(intern(acc_codes, acc_ids, p.account_id),
+                             intern(self.ccurrency_code, self.ccurrencies, p.currency),
+                             float(p.amount)) for p in je.postings]
+                    for a, c, x in legs:
+                        ent.append(seq)
+                        day.append(d)
+                        acc.append(a)
+                        cur.append(c)
+                        cat.append(g)
+                        amt.append(x)
+                    if len(legs) == 2 and legs[0][1] == legs[1][1] and legs[0][0] != legs[1][0] \
+                            and legs[0][2] == -legs[1][2]:
+                        # Plain transfer: the debit leg pays the credit leg
+                        payer, payee = (legs[0], legs[1]) if legs[0][2] < 0 else (legs[1], legs[0])
+                        flows = [(payer[0], payee[0], payee[1], payee[2])] if payee[2] > 0 else []
+                    else:
+                        flows = split_flows(legs)
+                    for payer, payee, c, x in flows:
+                        f_ent.append(seq)
+                        f_day.append(d)
+                        f_payer.append(payer)
+                        f_payee.append(payee)
+                        f_cur.append(c)
+                        f_amt.append(x)
+                self._append(entry=ent, day=day, account=acc, currency=cur, category=cat, amount=amt)
+                self._append_flows(entry=f_ent, day=f_day, payer=f_payer, payee=f_payee,
+                                   currency=f_cur, amount=f_amt)
+                added += len(amt)
+            self.cwatermark = stop
+            return added
+
+    def _select(self, currency: Optional[str], start: Optional[date], end: Optional[date], *names: str,
+                flows: bool = False):
+        """
+        The named posting (or flow) columns, synced and restricted to one currency
+        and an inclusive date range.
+        """
+        self.sync()
+        with self.clock:
+            store, n = (self.cflows, self.cflow_size) if flows else (self.ccols, self.csize)
+            cols = {name: arr[:n] for name, arr in store.items()}
+        code = self.ccurrency_code.get(currency or self.cledger.BASE_CURRENCY, -1)
+        mask = cols["currency"] == code
+        if start is not None:
+            mask &= cols["day"] >= day_number(start)
+        if end is not None:
+            mask &= cols["day"] <= day_number(end)
+        return {name: cols[name][mask] for name in names}
+
+    @staticmethod
+    def _first_legs(entry: np.ndarray) -> np.ndarray:
+        """1.0 on the first selected posting of each entry (entries are contiguous)."""
+        first = np.ones(len(entry), dtype=np.float64)
+        first[1:] = entry[1:] != entry[:-1]
+        return first
+
+    @staticmethod
+    def _top(values: np.ndarray, limit: Optional[int]) -> np.ndarray:
+        """Indices of the largest values, descending."""
+        if limit is not None and limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        if limit is not None and limit < len(values):
+            idx = np.argpartition(-values, limit - 1)[:limit]
+        else:
+            idx = np.arange(len(values))
+        return idx[np.argsort(-values[idx], kind="stable")]
+
+    def daily(self, currency: Optional[str] = None, start: Optional[date] = None,
+              end: Optional[date] = None) -> List[dict]:
+        """Per day: transfer volume (sum of credits), entry count and posting count."""
+        s = self._select(currency, start, end, "day", "entry", "amount")
+        if not len(s["day"]):
+            return []
+        d0 = int(s["day"].min())
+        days = s["day"] - d0
+        postings = np.bincount(days)
+        volume = np.bincount(days, weights=np.clip(s["amount"], 0, None))
+        entries = np.bincount(days, weights=self._first_legs(s["entry"]))
+        return [{"date": day_date(d0 + i).isoformat(), "volume": float(volume[i]),
+                 "entries": int(entries[i]), "postings": int(postings[i])}
+                for i in np.flatnonzero(postings)]
+
+    def net_flows(self, currency: Optional[str] = None, start: Optional[date] = None,
+                  end: Optional[date] = None, limit: Optional[int] = None) -> List[dict]:
+        """Per account: inflow, outflow and net, largest absolute net first."""
+        s = self._select(currency, start, end, "account", "amount")
+        acc, amt = s["account"], s["amount"]
+        size = len(self.caccount_ids)
+        inflow = np.bincount(acc, weights=np.clip(amt, 0, None), minlength=size)
+        outflow = np.bincount(acc, weights=np.clip(-amt, 0, None), minlength=size)
+        touched = np.flatnonzero(np.bincount(acc, minlength=size))
+        net = inflow[touched] - outflow[touched]
+        return [{"account_id": self.caccount_ids[touched[i]], "inflow": float(inflow[touched[i]]),
+                 "outflow": float(outflow[touched[i]]), "net": float(net[i])}
+                for i in self._top(np.abs(net), limit)]
+
+    def top_pairs(self, currency: Optional[str] = None, start: Optional[date] = None,
+                  end: Optional[date] = None, limit: Optional[int] = 10) -> List[dict]:
+        """Directed payer -> payee pairs by volume (see split_flows for multi-leg entries)."""
+        s = self._select(currency, start, end, "payer", "payee", "amount", flows=True)
+        size = max(len(self.caccount_ids), 1)
+        keys = s["payer"].astype(np.int64) * size + s["payee"]
+        pairs, inv = np.unique(keys, return_inverse=True)
+        volume = np.bincount(inv, weights=s["amount"])
+        count = np.bincount(inv)
+        return [{"from": self.caccount_ids[pairs[i] // size], "to": self.caccount_ids[pairs[i] % size],
+                 "volume": float(volume[i]), "count": int(count[i])}
+                for i in self._top(volume, limit)]
+
+    def categories(self, currency: Optional[str] = None, start: Optional[date] = None,
+                   end: Optional[date] = None) -> List[dict]:
+        """Per metadata category: volume (sum of credits) and entry count, largest first."""
+        s = self._select(currency, start, end, "category", "entry", "amount")
+        cat = s["category"]
+        size = len(self.ccategories)
+        volume = np.bincount(cat, weights=np.clip(s["amount"], 0, None), minlength=size)
+        entries = np.bincount(cat, weights=self._first_legs(s["entry"]), minlength=size)
+        used = np.flatnonzero(np.bincount(cat, minlength=size))
+        return [{"category": self.ccategories[used[i]], "volume": float(volume[used[i]]),
+                 "entries": int(entries[used[i]])}
+                for i in self._top(volume[used], None)]
+
+
+REPORTS = ("daily", "flows", "pairs", "categories")
+
+
+def run_report(cols: LedgerColumns, report: str, currency: Optional[str] = None,
+               start: Optional[date] = None, end: Optional[date] = None,
+               limit: Optional[int] = None) -> List[dict]:
+    if report == "daily":
+        return cols.daily(currency, start, end)
+    if report == "flows":
+        return cols.net_flows(currency, start, end, limit)
+    if report == "pairs":
+        return cols.top_pairs(currency, start, end, limit or 10)
+    if report == "categories":
+        return cols.categories(currency, start, end)
+    raise ValueError(f"Unknown report: {report}")
+
+
+def main(argv=None):
+    from src.importer import detect_format, import_stream
+
+    ap = argparse.ArgumentParser(description="Aggregate reports over a ledger history")
+    ap.add_argument("report", choices=REPORTS)
+    ap.add_argument("--from", dest="source", required=True, help="CSV/NDJSON history to load (see src.importer)")
+    ap.add_argument("--currency", default=None)
+    ap.add_argument("--start", type=date.fromisoformat, default=None, help="first day (YYYY-MM-DD)")
+    ap.add_argument("--end", type=date.fromisoformat, default=None, help="last day (YYYY-MM-DD)")
+    ap.add_argument("--limit", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    ledger = Ledger()
+    with open(args.source, newline="") as fh:
+        import_stream(ledger, fh, detect_format(args.source))
+    cols = LedgerColumns(ledger)
+    t0 = time.perf_counter()
+    cols.sync()
+    t1 = time.perf_counter()
+    rows = run_report(cols, args.report, args.currency, args.start, args.end, args.limit)
+    t2 = time.perf_counter()
+    for row in rows:
+        print(json.dumps(row))
+    print(f"{cols.csize:,} postings exported in {t1 - t0:.2f}s, {args.report} in {t2 - t1:.3f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
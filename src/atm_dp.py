@@ -1,4 +1,18 @@
+from math import gcd
+
+from src.metrics import timed
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to the pure-Python passes
+    np = None
+
+# Upper bound on DP table cells for min_notes_fast (8 MB of int64 with NumPy)
+MAX_DP_CELLS = 1_000_000
+
+
 # Minimum number of notes to make amount with limited note counts (bounded knapsack)
+@timed("algobank_atm_min_notes", "Latency of min_notes in seconds.")
 def min_notes(amount: int, notes: list[int], counts: list[int]) -> int:
     INF = 10**9
     dp = [INF] * (amount + 1)
@@ -15,4 +29,114 @@ def min_notes(amount: int, notes: list[int], counts: list[int]) -> int:
                     dp[s] = dp[s - val] + take
             c -= take
             k <<= 1
-    return dp[amount] if dp[amount] < INF else -1
\ No newline at end of file
+    return dp[amount] if dp[amount] < INF else -1
+
+
+@timed("algobank_atm_min_notes_fast", "Latency of min_notes_fast in seconds.")
+def min_notes_fast(amount: int, notes: list[int], counts: list[int],
+                   max_cells: int = MAX_DP_CELLS) -> int:
+    """
+    Same result as min_notes, but scales the problem down by the GCD of the
+    usable denominations and runs each binary-split chunk as one vectorized
+    shifted-minimum pass. Raises ValueError if the table would exceed max_cells.
+    """
+    if amount < 0:
+        return -1
+    if amount == 0:
+        return 0
+
+    usable = [(d, c) for d, c in zip(notes, counts) if d > 0 and c > 0]
+    g = 0
+    for d, _ in usable:
+        g = gcd(g, d)
+    if g == 0 or amount % g or amount > sum(d * c for d, c in usable):
+        return -1
+
+    target = amount // g
+    if target + 1 > max_cells:
+        raise ValueError(f"Amount too large: DP table needs {target + 1} cells (limit {max_cells}).")
+
+    # Notes beyond target // denom can never be part of an optimal answer
+    scaled = [(d // g, min(c, target // (d // g))) for d, c in usable]
+    if np is None:
+        return min_notes(target, [d for d, _ in scaled], [c for _, c in scaled])
+
+    INF = 10**9
+    dp = np.full(target + 1, INF, dtype=np.int64)
+    dp[0] = 0
+    for denom, cnt in scaled:
+        _relax(dp, denom, cnt)
+    best = int(dp[target])
+    return best if best < INF else -1
+
+
+@timed("algobank_atm_plan_notes", "Latency of plan_notes in seconds.")
+def plan_notes(amount: int, notes: list[int], counts: list[int],
+               max_cells: int = MAX_DP_CELLS) -> list[int] | None:
+    """
+    Like min_notes_fast, but returns how many of each note to dispense
+    (aligned with notes), or None if the amount cannot be paid out.
+    Keeps one DP layer per denomination and walks them backwards.
+    """
+    if amount < 0:
+        return None
+    plan = [0] * len(notes)
+    if amount == 0:
+        return plan
+
+    usable = [i for i, (d, c) in enumerate(zip(notes, counts)) if d > 0 and c > 0]
+    g = 0
+    for i in usable:
+        g = gcd(g, notes[i])
+    if g == 0 or amount % g or amount > sum(notes[i] * counts[i] for i in usable):
+        return None
+
+    target = amount // g
+    if target + 1 > max_cells:
+        raise ValueError(f"Amount too large: DP table needs {target + 1} cells (limit {max_cells}).")
+
+    INF = 10**9
+    if np is None:
+        dp = [INF] * (target + 1)
+    else:
+        dp = np.full(target + 1, INF, dtype=np.int64)
+    dp[0] = 0
+    layers = []
+    for i in usable:
+        denom = notes[i] // g
+        _relax(dp, denom, min(counts[i], target // denom))
+        layers.append(dp.copy())
+    if layers[-1][target] >= INF:
+        return None
+
+    s = target
+    for j in range(len(usable) - 1, -1, -1):
+        i = usable[j]
+        denom = notes[i] // g
+        cur = layers[j][s]
+        for k in range(min(counts[i], s // denom) + 1):
+            rest = s - k * denom
+            prev = layers[j - 1][rest] if j else (0 if rest == 0 else INF)
+            if prev + k == cur:
+                plan[i] = k
+                s = rest
+                break
+    return plan
+
+
+def _relax(dp, denom: int, cnt: int) -> None:
+    """Apply cnt notes of value denom to dp in place via binary splitting."""
+    k = 1
+    c = cnt
+    while c > 0:
+        take = min(k, c)
+        val = take * denom
+        if np is not None and isinstance(dp, np.ndarray):
+            # dp[:-val] + take is materialized first, so every chunk is used at most once
+            np.minimum(dp[val:], dp[:-val] + take, out=dp[val:])
+        else:
+            for s in range(len(dp) - 1, val - 1, -1):
+                if dp[s - val] + take < dp[s]:
+                    dp[s] = dp[s - val] + take
+        c -= take
+        k <<= 1
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.atm_dp import plan_notes
+
+DEFAULT_NOTES = [500, 200, 100, 50, 20, 10]
+
+
+class ATMFleet:
+    """
+    Cash inventory for a fleet of ATMs, each with its own cassette counts.
+    Plans withdrawals with the bounded-knapsack DP and replays whole days of
+    requests, spreading independent machines across a process pool.
+    """
+
+    def __init__(self, notes: List[int] | None = None):
+        self.cnotes: List[int] = list(notes or DEFAULT_NOTES)
+        self.cinventory: Dict[str, List[int]] = {}
+
+    def add_atm(self, atm_id: str, counts: List[int]):
+        """Register an ATM with one cassette count per denomination."""
+        if len(counts) != len(self.cnotes):
+            raise ValueError("Need one cassette count per denomination.")
+        self.cinventory[atm_id] = list(counts)
+
+    def inventory(self, atm_id: str) -> Dict[int, int]:
+        """Return the cassette counts of an ATM keyed by denomination."""
+        if atm_id not in self.cinventory:
+            raise KeyError("Unknown ATM ID.")
+        return dict(zip(self.cnotes, self.cinventory[atm_id]))
+
+    def withdraw(self, atm_id: str, amount: int) -> Optional[List[int]]:
+        """
+        Dispense amount from one ATM using the fewest notes.
+        Returns the notes taken per denomination, or None if rejected.
+        """
+        if atm_id not in self.cinventory:
+            raise KeyError("Unknown ATM ID.")
+        return _dispense(self.cnotes, self.cinventory[atm_id], amount)
+
+    def replay(self, withdrawals: Iterable[Tuple[str, int]],
+               workers: int | None = None) -> List[Optional[List[int]]]:
+        """
+        Replay a stream of (atm_id, amount) requests in order, updating inventories.
+        Requests are grouped per ATM (machines never share cash), so groups run
+        independently; workers > 1 uses a process pool, None means os.cpu_count().
+        Returns one plan (or None if rejected) per request, in input order.
+        """
+        per_atm: Dict[str, List[Tuple[int, int]]] = {}
+        for pos, (atm_id, amount) in enumerate(withdrawals):
+            if atm_id not in self.cinventory:
+                raise KeyError("Unknown ATM ID.")
+            per_atm.setdefault(atm_id, []).append((pos, amount))
+
+        jobs = [(atm_id, self.cinventory[atm_id], reqs) for atm_id, reqs in per_atm.items()]
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(jobs) > 1:
+            # One task per batch of ATMs keeps pickling overhead low
+            size = -(-len(jobs) // (workers * 4))
+            batches = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                done = [r for part in pool.map(_replay_batch, [self.cnotes] * len(batches), batches)
+                        for r in part]
+        else:
+            done = _replay_batch(self.cnotes, jobs)
+
+        total = sum(len(reqs) for reqs in per_atm.values())
+        results: List[Optional[List[int]]] = [None] * total
+        for atm_id, counts, plans in done:
+            self.cinventory[atm_id] = counts
+            for pos, plan in plans:
+                results[pos] = plan
+        return results
+
+
+def _dispense(notes: List[int], counts: List[int], amount: int) -> Optional[List[int]]:
+    """Plan a withdrawal and deduct it from counts in place."""
+    try:
+        plan = plan_notes(amount, notes, counts)
+    except ValueError:
+        return None
+    if plan is None:
+        return None
+    for i, k in enumerate(plan):
+        counts[i] -= k
+    return plan
+
+
+def _replay_batch(notes, jobs):
+    """Worker entry point: replay each ATM's requests against a copy of its inventory."""
+    out = []
+    for atm_id, counts, reqs in jobs:
+        counts = list(counts)
+        out.append((atm_id, counts, [(pos, _dispense(notes, counts, amount)) for pos, amount in reqs]))
+    return out
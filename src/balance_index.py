@@ -0,0 +1,179 @@
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+Key = Tuple[Decimal, str]
+
+
+class BucketSortedList:
+    """
+    Sorted multiset kept as a list of short sorted buckets (sqrt decomposition).
+    Insert/remove cost one bisect over bucket maxima plus an O(LOAD) list shift,
+    both done in C; rank and positional lookups walk bucket lengths.
+    """
+
+    LOAD = 512  # buckets split when they reach 2 * LOAD keys
+
+    def __init__(self):
+        self.cbuckets: List[list] = []
+        self.cmaxes: list = []
+        self.csize = 0
+
+    def __len__(self) -> int:
+        return self.csize
+
+    def insert(self, key):
+        """Insert key (duplicates allowed)."""
+        if not self.cbuckets:
+            self.cbuckets.append([key])
+            self.cmaxes.append(key)
+            self.csize = 1
+            return
+        i = bisect_left(self.cmaxes, key)
+        if i == len(self.cbuckets):
+            i -= 1
+        bucket = self.cbuckets[i]
+        insort(bucket, key)
+        self.cmaxes[i] = bucket[-1]
+        if len(bucket) >= 2 * self.LOAD:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self.cbuckets.insert(i + 1, half)
+            self.cmaxes[i] = bucket[-1]
+            self.cmaxes.insert(i + 1, half[-1])
+        self.csize += 1
+
+    def remove(self, key):
+        """Remove one occurrence of key. Raises KeyError if absent."""
+        i = bisect_left(self.cmaxes, key)
+        if i == len(self.cbuckets):
+            raise KeyError(key)
+        bucket = self.cbuckets[i]
+        j = bisect_left(bucket, key)
+        if bucket[j] != key:
+            raise KeyError(key)
+        del bucket[j]
+        if bucket:
+            self.cmaxes[i] = bucket[-1]
+        else:
+            del self.cbuckets[i]
+            del self.cmaxes[i]
+        self.csize -= 1
+
+    def _offset(self, i: int) -> int:
+        return sum(len(b) for b in self.cbuckets[:i])
+
+    def bisect_left(self, key) -> int:
+        """Number of keys strictly less than key."""
+        i = bisect_left(self.cmaxes, key)
+        if i == len(self.cbuckets):
+            return self.csize
+        return self._offset(i) + bisect_left(self.cbuckets[i], key)
+
+    def bisect_right(self, key) -> int:
+        """Number of keys less than or equal to key."""
+        i = bisect_right(self.cmaxes, key)
+        if i == len(self.cbuckets):
+            return self.csize
+        return self._offset(i) + bisect_right(self.cbuckets[i], key)
+
+    def __getitem__(self, i: int):
+        """Key at sorted position i."""
+        if i < 0:
+            i += self.csize
+        if not 0 <= i < self.csize:
+            raise IndexError("sorted list index out of range")
+        return self.slice(i, i + 1)[0]
+
+    def slice(self, start: int, stop: int) -> list:
+        """Keys at positions [start, stop) in ascending order."""
+        start, stop = max(start, 0), min(stop, self.csize)
+        out: list = []
+        if start >= stop:
+            return out
+        pos = 0
+        for bucket in self.cbuckets:
+            end = pos + len(bucket)
+            if end > start:
+                out.extend(bucket[max(start - pos, 0):stop - pos])
+                if end >= stop:
+                    break
+            pos = end
+        return out
+
+
+class BalanceIndex:
+    """
+    Order-statistics index over account balances keyed by (balance, account_id).
+    Supports top-N / bottom-N, rank-of-account, balance-range queries and
+    cursor pagination without copying the whole account table.
+    """
+
+    def __init__(self):
+        self.cbalances: Dict[str, Decimal] = {}
+        self.clist = BucketSortedList()
+
+    def __len__(self) -> int:
+        return len(self.clist)
+
+    def update(self, account_id: str, balance: Decimal):
+        """Insert or move an account to its new balance. Time complexity: O(log n)"""
+        old = self.cbalances.get(account_id)
+        if old is not None:
+            if old == balance:
+                return
+            self.clist.remove((old, account_id))
+        self.clist.insert((balance, account_id))
+        self.cbalances[account_id] = balance
+
+    def remove(self, account_id: str):
+        """Drop an account from the index if present."""
+        old = self.cbalances.pop(account_id, None)
+        if old is not None:
+            self.clist.remove((old, account_id))
+
+    def top(self, n: int) -> List[Tuple[str, Decimal]]:
+        """The n highest balances, richest first."""
+        return [(a, b) for b, a in reversed(self.clist.slice(len(self.clist) - n, len(self.clist)))]
+
+    def bottom(self, n: int) -> List[Tuple[str, Decimal]]:
+        """The n lowest balances, poorest first."""
+        return [(a, b) for b, a in self.clist.slice(0, n)]
+
+    def rank(self, account_id: str, descending: bool = True) -> int:
+        """0-based position of account_id (0 = highest balance when descending)."""
+        if account_id not in self.cbalances:
+            raise KeyError("Unknown account ID.")
+        pos = self.clist.bisect_left((self.cbalances[account_id], account_id))
+        return len(self.clist) - 1 - pos if descending else pos
+
+    def balance_range(self, lo: Decimal | None = None, hi: Decimal | None = None,
+                      limit: int | None = None, after: Key | None = None) -> List[Tuple[str, Decimal]]:
+        """
+        Accounts with lo <= balance <= hi in ascending order (bounds optional),
+        resuming strictly after the (balance, account_id) cursor if given.
+        """
+        start = 0 if lo is None else self.clist.bisect_left((lo, ""))
+        if after is not None:
+            start = max(start, self.clist.bisect_right(after))
+        stop = len(self.clist)
+        if hi is not None:
+            # "\U0010ffff" sorts after any account ID with the same balance
+            stop = self.clist.bisect_right((hi, "\U0010ffff"))
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return [(a, b) for b, a in self.clist.slice(start, stop)]
+
+    def page(self, limit: int, after: Key | None = None,
+             descending: bool = True) -> List[Tuple[str, Decimal]]:
+        """
+        Cursor pagination: up to limit accounts strictly after the (balance, account_id)
+        cursor in the chosen order. Stable under concurrent updates to other accounts.
+        """
+        if descending:
+            stop = len(self.clist) if after is None else self.clist.bisect_left(after)
+            keys = reversed(self.clist.slice(stop - limit, stop))
+        else:
+            start = 0 if after is None else self.clist.bisect_right(after)
+            keys = self.clist.slice(start, start + limit)
+        return [(a, b) for b, a in keys]
@@ -0,0 +1,157 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.ledger import JournalEntry, Ledger
+
+
+class Subscription:
+    """One connected client: a C-level queue of pre-encoded SSE frames."""
+
+    __slots__ = ("account_id", "cqueue")
+
+    def __init__(self, account_id: str):
+        self.account_id = account_id
+        self.cqueue: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Next frame, or None if nothing arrived within timeout."""
+        try:
+            return self.cqueue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroker:
+    """
+    Per-account publish/subscribe registry for server-sent events.
+    Registered as a Ledger listener: every new posting produces a small
+    'posting' event and a 'balance' event for the affected account, encoded
+    once and pushed to that account's subscribers only. Accounts that have
+    never had a subscriber are skipped, so bulk posting pays almost nothing.
+    The last `history` events per watched account are kept so clients can
+    resume via Last-Event-ID. Once an account's last subscriber leaves, its
+    history is dropped after `grace` seconds and the account stops being
+    watched; a client resuming after that gets a 'reset'.
+    """
+
+    def __init__(self, ledger: Ledger, names: Optional[Dict[str, str]] = None, history: int = 100,
+                 grace: float = 60.0):
+        self.cledger = ledger
+        self.cnames = names if names is not None else {}
+        self.chistory = history
+        self.csubs: Dict[str, Set[Subscription]] = {}
+        self.crecent: Dict[str, Deque[Tuple[int, str]]] = {}
+        self.cevicted: Dict[str, int] = {}  # newest event id dropped from each history
+        self.cgrace = grace
+        self.cidle: Dict[str, float] = {}  # account -> when its last subscriber left, oldest first
+        self.cnext_id = 1
+        self.clock = threading.Lock()
+        ledger.add_listener(self.on_entries)
+
+    def subscribe(self, account_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Register a client. If last_event_id is given, events it missed are queued
+        first; if they already fell out of the history, a 'reset' event tells the
+        client to re-fetch its full state once.
+        """
+        sub = Subscription(account_id)
+        with self.clock:
+            self._expire()
+            self.cidle.pop(account_id, None)
+            if last_event_id:
+                try:
+                    last = int(last_event_id)
+                except ValueError:
+                    last = -1
+                if last < 0 or last >= self.cnext_id or account_id not in self.crecent \
+                        or last < self.cevicted.get(account_id, 0):
+                    # Unknown id (e.g. server restart), expired history or gap: client must re-fetch
+                    sub.cqueue.put(self._frame(None, "reset", {}))
+                else:
+                    for eid, frame in self.crecent.get(account_id, ()):
+                        if eid > last:
+                            sub.cqueue.put(frame)
+            self.csubs.setdefault(account_id, set()).add(sub)
+            self.crecent.setdefault(account_id, deque())
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self.clock:
+            subs = self.csubs.get(sub.account_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self.csubs[sub.account_id]
+                    self.cidle[sub.account_id] = time.monotonic()
+            self._expire()
+
+    def _expire(self):
+        """Stop watching accounts idle for longer than the grace period (caller holds clock)."""
+        now = time.monotonic()
+        while self.cidle:
+            account_id, since = next(iter(self.cidle.items()))
+            if now - since < self.cgrace:
+                break
+            del self.cidle[account_id]
+            self.crecent.pop(account_id, None)
+            self.cevicted.pop(account_id, None)
+
+    def subscriber_count(self) -> int:
+        return sum(len(s) for s in self.csubs.values())
+
+    def publish(self, account_id: str, event: str, data: Dict[str, object]):
+        """Record an event for account_id and fan it out to its subscribers."""
+        with self.clock:
+            eid = self.cnext_id
+            self.cnext_id += 1
+            frame = self._frame(eid, event, data)
+            recent = self.crecent.get(account_id)
+            if recent is None:
+                recent = self.crecent[account_id] = deque()
+            recent.append((eid, frame))
+            if len(recent) > self.chistory:
+                self.cevicted[account_id] = recent.popleft()[0]
+            for sub in self.csubs.get(account_id, ()):
+                sub.cqueue.put(frame)
+
+    def on_entries(self, entries: List[JournalEntry]):
+        """Ledger listener: turn new postings into posting/balance events."""
+        if self.cidle:
+            with self.clock:
+                self._expire()
+        now = datetime.now()
+        touched = []
+        watched = self.crecent
+        for je in entries:
+            for p in je.postings:
+                if p.account_id not in watched:
+                    continue
+                counterparty = None
+                for o in je.postings:
+                    if o.account_id != p.account_id:
+                        counterparty = self.cnames.get(o.account_id, f"Account ****{o.account_id[-4:]}")
+                self.publish(p.account_id, "posting", {
+                    "id": je.entry_id[:8],
+                    "amount": str(p.amount),
+                    "currency": p.currency,
+                    "description": je.metadata.get("desc", "Transaction"),
+                    "counterparty": counterparty or "External",
+                    "date": now.strftime("%Y-%m-%d"),
+                    "time": now.strftime("%H:%M"),
+                    "type": "debit" if p.amount < 0 else "credit",
+                })
+                if (p.account_id, p.currency) not in touched:
+                    touched.append((p.account_id, p.currency))
+        for aid, currency in touched:
+            self.publish(aid, "balance", {"balance": str(self.cledger.balance(aid, currency)),
+                                          "currency": currency})
+
+    @staticmethod
+    def _frame(eid: Optional[int], event: str, data: Dict[str, object]) -> str:
+        head = f"id: {eid}\n" if eid is not None else ""
+        return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -1,3 +1,7 @@
+from src.metrics import counted
+from src.snapshot import LazyMap, Snapshot, string_sections, write_snapshot
+
+
 class DSU:
     """
     Disjoint Set Union (Union-Find) for clustering accounts.
@@ -7,12 +11,14 @@ class DSU:
     def __init__(self):
         self.cpar = {}
         self.crank = {}
+        self.csets = 0
 
     def add(self, x):
         """Add a new element to the DSU if not present."""
         if x not in self.cpar:
             self.cpar[x] = x
             self.crank[x] = 0
+            self.csets += 1
 
     def find(self, x):
         """Find the root representative of x with path compression."""
@@ -20,6 +26,7 @@ class DSU:
             self.cpar[x] = self.find(self.cpar[x])
         return self.cpar[x]
 
+    @counted("algobank_dsu_union", "Number of DSU.union calls.")
     def union(self, a, b):
         """Union two sets (a, b). Returns True if merged, False if already in same set."""
         ra, rb = self.find(a), self.find(b)
@@ -30,10 +37,38 @@ class DSU:
         self.cpar[rb] = ra
         if self.crank[ra] == self.crank[rb]:
             self.crank[ra] += 1
+        self.csets -= 1
         return True
 
     def connected(self, a, b) -> bool:
         """Check if two elements are in the same set."""
         if a not in self.cpar or b not in self.cpar:
             return False
-        return self.find(a) == self.find(b)
\ No newline at end of file
+        return self.find(a) == self.find(b)
+
+    def cluster_count(self) -> int:
+        """Number of disjoint clusters currently tracked."""
+        return self.csets
+
+    def save(self, path: str):
+        """Write a snapshot with every element pointing straight at its root (string keys only)."""
+        if not all(isinstance(x, str) for x in self.cpar):
+            raise TypeError("DSU snapshots require string elements.")
+        elems = sorted(self.cpar)
+        index = {x: i for i, x in enumerate(elems)}
+        parents = [index[self.find(x)] for x in elems]
+        ranks = [self.crank[x] for x in elems]
+        write_snapshot(path, b"DSU_", string_sections(elems) + [
+            (b"PRNT", "I", parents), (b"RANK", "B", ranks), (b"META", "Q", [self.csets])])
+
+    @classmethod
+    def load(cls, path: str) -> "DSU":
+        """Memory-map a snapshot; parent/rank entries are decoded on first lookup."""
+        snap = Snapshot(path, b"DSU_")
+        names = snap.strings()
+        parents, ranks = snap.array(b"PRNT"), snap.array(b"RANK")
+        dsu = cls()
+        dsu.cpar = LazyMap(names, lambda i: names[parents[i]])
+        dsu.crank = LazyMap(names, lambda i: ranks[i])
+        dsu.csets = snap.array(b"META")[0]
+        return dsu
\ No newline at end of file
@@ -0,0 +1,141 @@
+import csv
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.ledger import JournalEntry, Ledger
+
+
+class RateTable:
+    """
+    FX rates quoted against one pivot currency: rates[c] = units of c per 1 pivot.
+    Cross rates are derived through the pivot and cached, so repeated lookups
+    (and whole rate vectors for a reporting currency) cost a dict hit.
+    """
+
+    def __init__(self, pivot: str, rates: Dict[str, Decimal]):
+        self.cpivot = pivot
+        self.crates: Dict[str, Decimal] = {pivot: Decimal("1"), **{c: Decimal(str(r)) for c, r in rates.items()}}
+        for c, r in self.crates.items():
+            if r <= 0:
+                raise ValueError(f"Invalid FX rate for {c}: {r}")
+        self.ccross: Dict[Tuple[str, str], Decimal] = {}
+
+    @classmethod
+    def load(cls, path: str, pivot: str = "EUR") -> "RateTable":
+        """Load a CSV with currency,rate rows (units of currency per 1 pivot)."""
+        with open(path, newline="") as fh:
+            rows = [r for r in csv.reader(fh) if r and not r[0].startswith("#")]
+        if rows and rows[0][0].lower() == "currency":
+            rows = rows[1:]
+        return cls(pivot, {c.strip(): Decimal(r.strip()) for c, r in rows})
+
+    def currencies(self) -> List[str]:
+        return sorted(self.crates)
+
+    def rate(self, frm: str, to: str) -> Decimal:
+        """Units of `to` per 1 unit of `frm`."""
+        key = (frm, to)
+        r = self.ccross.get(key)
+        if r is None:
+            if frm not in self.crates or to not in self.crates:
+                raise KeyError(f"No FX rate for {frm}/{to}.")
+            r = self.ccross[key] = self.crates[to] / self.crates[frm]
+        return r
+
+    def convert(self, amount: Decimal, frm: str, to: str) -> Decimal:
+        return amount * self.rate(frm, to)
+
+
+class FXBook:
+    """
+    Columnar mirror of every account's holdings for fast revaluation.
+    A float64 matrix (accounts x currencies) is seeded from the ledger once and
+    kept current through the ledger listener hook; revaluing the whole bank is
+    then a batched matrix-vector product against the reporting currency's rate
+    vector. Exact balances stay in the ledger's Decimals; this book is for
+    reporting, where float precision (~15 significant digits) is ample.
+    """
+
+    def __init__(self, ledger: Ledger, initial_capacity: int = 1024):
+        self.cledger = ledger
+        self.crow: Dict[str, int] = {}
+        self.caccount_ids: List[str] = []
+        self.ccol: Dict[str, int] = {}
+        self.ccurrencies: List[str] = []
+        self.cmatrix = np.zeros((initial_capacity, 4), dtype=np.float64)
+        for aid in ledger.caccounts:
+            for currency, amount in ledger.holdings(aid).items():
+                self._add(aid, currency, float(amount))
+        ledger.add_listener(self.on_entries)
+
+    def _row(self, account_id: str) -> int:
+        r = self.crow.get(account_id)
+        if r is None:
+            r = self.crow[account_id] = len(self.caccount_ids)
+            self.caccount_ids.append(account_id)
+            if r >= self.cmatrix.shape[0]:
+                grown = np.zeros((self.cmatrix.shape[0] * 2, self.cmatrix.shape[1]), dtype=np.float64)
+                grown[:r] = self.cmatrix
+                self.cmatrix = grown
+        return r
+
+    def _col(self, currency: str) -> int:
+        c = self.ccol.get(currency)
+        if c is None:
+            c = self.ccol[currency] = len(self.ccurrencies)
+            self.ccurrencies.append(currency)
+            if c >= self.cmatrix.shape[1]:
+                grown = np.zeros((self.cmatrix.shape[0], self.cmatrix.shape[1] * 2), dtype=np.float64)
+                grown[:, :c] = self.cmatrix
+                self.cmatrix = grown
+        return c
+
+    def _add(self, account_id: str, currency: str, amount: float):
+        # Resolve both indices first: either may reallocate the matrix
+        r, c = self._row(account_id), self._col(currency)
+        self.cmatrix[r, c] += amount
+
+    def on_entries(self, entries: List[JournalEntry]):
+        """Ledger listener: apply new postings to the matrix."""
+        for je in entries:
+            for p in je.postings:
+                self._add(p.account_id, p.currency, float(p.amount))
+
+    def rate_vector(self, rates: RateTable, reporting: str) -> np.ndarray:
+        """Conversion factor into `reporting` for every matrix column; 0 for unrated columns."""
+        vec = np.zeros(self.cmatrix.shape[1], dtype=np.float64)
+        for currency, c in self.ccol.items():
+            if currency in rates.crates:
+                vec[c] = float(rates.rate(currency, reporting))
+        return vec
+
+    def unrated(self, rates: RateTable) -> List[str]:
+        """Currencies held in the book that `rates` cannot convert (left out of revaluations)."""
+        return sorted(c for c in self.ccol if c not in rates.crates)
+
+    def revalue(self, rates: RateTable, reporting: str, batch_size: int = 1 << 18) -> np.ndarray:
+        """
+        Every account's total holdings in `reporting`, aligned with self.caccount_ids.
+        Works in row batches so temporaries stay small for very large books.
+        """
+        n = len(self.caccount_ids)
+        vec = self.rate_vector(rates, reporting)
+        out = np.empty(n, dtype=np.float64)
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            np.dot(self.cmatrix[start:stop], vec, out=out[start:stop])
+        return out
+
+    def exposure(self) -> Dict[str, float]:
+        """Bank-wide net holdings per currency."""
+        n = len(self.caccount_ids)
+        sums = self.cmatrix[:n].sum(axis=0)
+        return {c: float(sums[i]) for c, i in self.ccol.items()}
+
+    def account_total(self, rates: RateTable, reporting: str, account_id: str) -> float:
+        r = self.crow.get(account_id)
+        if r is None:
+            return 0.0
+        return float(self.cmatrix[r] @ self.rate_vector(rates, reporting))
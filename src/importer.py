@@ -0,0 +1,274 @@
+"""
+Streaming bulk import of historical transactions from CSV or NDJSON.
+
+One row per posting; consecutive rows sharing an entry_id form one journal entry:
+
+    entry_id,account_id,amount,currency,desc,timestamp,category
+    tx-1,ACC-1,-25.00,EUR,Coffee,2024-01-02T08:00:00,transfer
+    tx-1,ACC-2,25.00,EUR,Coffee,2024-01-02T08:00:00,transfer
+
+Rows are read lazily and applied in fixed-size chunks of complete entries
+through Ledger.post_many, so memory stays bounded by the chunk size.
+
+The command line is a dry run: it imports into a throwaway in-memory ledger
+to validate a file and report rejects and throughput before a migration.
+
+    python -m src.importer history.csv --chunk-size 10000 --rejects rejects.ndjson
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.ledger import Ledger, Posting, check_balanced
+
+REQUIRED_FIELDS = ("entry_id", "account_id", "amount")
+METADATA_FIELDS = ("desc", "timestamp", "category")
+
+
+@dataclass
+class ImportStats:
+    """Running totals for an import; rejects keeps only the first max_rejects samples."""
+    rows_read: int = 0
+    rows_imported: int = 0
+    entries_imported: int = 0
+    rows_rejected: int = 0
+    accounts_created: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    rejects: List[Dict[str, object]] = field(default_factory=list)
+    error: Optional[str] = None  # why the stream was abandoned, if it was
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "rows_read": self.rows_read,
+            "rows_imported": self.rows_imported,
+            "entries_imported": self.entries_imported,
+            "rows_rejected": self.rows_rejected,
+            "accounts_created": self.accounts_created,
+            "chunks": self.chunks,
+            "elapsed_s": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+            "rejects": self.rejects,
+            **({"error": self.error} if self.error else {}),
+        }
+
+
+def detect_format(filename: str) -> str:
+    return "ndjson" if filename.lower().endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def iter_rows(fh: TextIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line_no, row) lazily; NDJSON lines that fail to parse yield the error instead."""
+    if fmt == "csv":
+        reader = csv.DictReader(fh)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"Invalid JSON: {e}")
+                continue
+            yield line_no, row if isinstance(row, dict) else ValueError("Row must be a JSON object")
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _parse_posting(row) -> Posting:
+    if isinstance(row, Exception):
+        raise row
+    for name in REQUIRED_FIELDS:
+        if not row.get(name):
+            raise ValueError(f"Missing field: {name}")
+    try:
+        amount = Decimal(str(row["amount"]))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {row['amount']!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {row['amount']!r}")
+    return Posting(str(row["account_id"]), amount, str(row.get("currency") or "EUR"))
+
+
+def iter_entries(rows: Iterable[Tuple[int, object]], reject: Callable[[int, str], None]):
+    """
+    Group consecutive rows by entry_id into (entry_id, postings, metadata, line_nos).
+    Malformed rows and unbalanced entries are passed to reject and skipped.
+    """
+    cur_id, postings, metadata, lines, bad = None, [], {}, [], None
+
+    def flush():
+        if cur_id is None:
+            return None
+        if bad is not None:
+            for ln in lines:
+                reject(ln, bad)
+            return None
+        try:
+            check_balanced(postings)
+        except ValueError as e:
+            for ln in lines:
+                reject(ln, str(e))
+            return None
+        return cur_id, postings, metadata, lines
+
+    for line_no, row in rows:
+        eid = row.get("entry_id") if isinstance(row, dict) else None
+        if eid is None or str(eid) != cur_id:
+            done = flush()
+            if done:
+                yield done
+            cur_id = None if eid is None else str(eid)
+            postings, metadata, lines, bad = [], {}, [], None
+        try:
+            postings.append(_parse_posting(row))
+        except ValueError as e:
+            if cur_id is None:
+                reject(line_no, str(e))  # row without an entry_id stands alone
+                continue
+            bad = bad or f"Entry rejected: line {line_no}: {e}"
+        lines.append(line_no)
+        if not metadata:
+            metadata = {k: str(row[k]) for k in METADATA_FIELDS if row.get(k)}
+    done = flush()
+    if done:
+        yield done
+
+
+def import_stream(ledger: Ledger, fh: TextIO, fmt: str = "csv", chunk_size: int = 10_000,
+                  progress: Optional[Callable[[ImportStats], None]] = None,
+                  on_reject: Optional[Callable[[int, str], None]] = None,
+                  max_rejects: int = 100,
+                  allow_account: Optional[Callable[[str], bool]] = None,
+                  allow_currency: Optional[Callable[[str], bool]] = None,
+                  on_open: Optional[Callable[[List[str]], None]] = None) -> ImportStats:
+    """
+    Stream rows from fh into ledger in chunks of roughly chunk_size rows (entries are
+    never split). Unknown accounts are opened on first use and handed to on_open
+    once per chunk. Entries whose entry_id is already in the journal are
+    rejected, so re-running an import is a no-op; so are entries touching an
+    account allow_account refuses or a currency allow_currency refuses. Calls
+    progress after every chunk and on_reject for every rejected row.
+    A stream that cannot be read any further (bad encoding, malformed CSV)
+    stops the import: chunks already applied stay, the one being read is
+    dropped, and stats.error says why.
+    """
+    stats = ImportStats()
+    start = time.perf_counter()
+
+    def reject(line_no: int, reason: str):
+        stats.rows_rejected += 1
+        if len(stats.rejects) < max_rejects:
+            stats.rejects.append({"line": line_no, "reason": reason})
+        if on_reject:
+            on_reject(line_no, reason)
+
+    def counted_rows():
+        for item in iter_rows(fh, fmt):
+            stats.rows_read += 1
+            yield item
+
+    def apply(chunk, rows):
+        opened = []
+        for _, postings, _ in chunk:
+            for p in postings:
+                if p.account_id not in ledger.caccounts:
+                    ledger.open_account(p.account_id)
+                    opened.append(p.account_id)
+        ledger.post_many(chunk)
+        stats.accounts_created += len(opened)
+        if on_open and opened:
+            on_open(opened)
+        stats.rows_imported += rows
+        stats.entries_imported += len(chunk)
+        stats.chunks += 1
+        stats.elapsed = time.perf_counter() - start
+        if progress:
+            progress(stats)
+
+    def refusal(eid, postings):
+        if eid in chunk_ids or ledger.has_entry(eid):
+            return f"Duplicate entry ID: {eid}"
+        if allow_currency:
+            bad = next((p.currency for p in postings if not allow_currency(p.currency)), None)
+            if bad is not None:
+                return f"Unsupported currency: {bad}"
+        if allow_account:
+            denied = next((p.account_id for p in postings if not allow_account(p.account_id)), None)
+            if denied is not None:
+                return f"Account not permitted: {denied}"
+        return None
+
+    chunk, chunk_rows, chunk_lines, chunk_ids = [], 0, 0, set()
+    try:
+        for eid, postings, metadata, lines in iter_entries(counted_rows(), reject):
+            reason = refusal(eid, postings)
+            if reason:
+                for ln in lines:
+                    reject(ln, reason)
+                continue
+            chunk.append((eid, postings, metadata))
+            chunk_ids.add(eid)
+            chunk_rows += len(postings)
+            chunk_lines += len(lines)
+            if chunk_rows >= chunk_size:
+                apply(chunk, chunk_lines)
+                chunk, chunk_rows, chunk_lines, chunk_ids = [], 0, 0, set()
+    except (UnicodeDecodeError, csv.Error) as e:
+        stats.error = f"Unreadable input after row {stats.rows_read}: {e}"
+        chunk = []
+    if chunk:
+        apply(chunk, chunk_lines)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Dry-run import of a CSV/NDJSON history: validate it and "
+                                             "report rejects; nothing is persisted")
+    ap.add_argument("path", help="input file, or - for stdin")
+    ap.add_argument("--format", choices=("csv", "ndjson"), help="default: from file extension")
+    ap.add_argument("--chunk-size", type=int, default=10_000)
+    ap.add_argument("--rejects", help="write rejected rows here as NDJSON")
+    args = ap.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    ledger = Ledger()
+    rej_fh = open(args.rejects, "w") if args.rejects else None
+
+    def on_reject(line_no, reason):
+        if rej_fh:
+            rej_fh.write(json.dumps({"line": line_no, "reason": reason}) + "\n")
+
+    def progress(st):
+        print(f"\r{st.rows_read:,} rows  {st.entries_imported:,} entries  "
+              f"{st.rows_rejected:,} rejected  {st.rows_per_sec:,.0f} rows/s", end="", file=sys.stderr)
+
+    fh = sys.stdin if args.path == "-" else open(args.path, newline="")
+    try:
+        stats = import_stream(ledger, fh, fmt, args.chunk_size, progress, on_reject)
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+        if rej_fh:
+            rej_fh.close()
+    print(file=sys.stderr)
+    summary = stats.as_dict()
+    summary.pop("rejects")
+    print(json.dumps(summary, indent=2))
+    return 0 if stats.rows_rejected == 0 and not stats.error else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Callable, List, Dict, Set, Tuple
 import uuid
 from decimal import Decimal
 
+from src.balance_index import BalanceIndex
+from src.metrics import timed
+
 
 @dataclass(frozen=True)
 class Posting:
@@ -12,6 +15,16 @@ class Posting:
     currency: str = "EUR"
 
 
+def check_balanced(postings: List[Posting]):
+    """Raise ValueError unless the postings sum to zero within every currency."""
+    totals: Dict[str, Decimal] = {}
+    for p in postings:
+        totals[p.currency] = totals.get(p.currency, Decimal("0")) + p.amount
+    for currency, total in totals.items():
+        if total != Decimal("0"):
+            raise ValueError(f"Double-entry violation: {currency} postings must sum to zero.")
+
+
 @dataclass(frozen=True)
 class JournalEntry:
     """A complete double-entry transaction."""
@@ -24,40 +37,121 @@ class Ledger:
     """
     A lightweight in-memory ledger using Python dictionaries.
     Demonstrates Hash Map operations (O(1) lookups) and double-entry validation.
+    Balances are kept per (account, currency): caccounts holds the ledger's base
+    currency (what the app, balance index and statements work in) and
+    cforeign holds every other currency an account has touched.
     """
 
+    BASE_CURRENCY = "EUR"
+
     def __init__(self):
         self.caccounts: Dict[str, Decimal] = {}
+        self.cforeign: Dict[str, Dict[str, Decimal]] = {}
         self.centries: List[JournalEntry] = []
+        self.centry_ids: Set[str] = set()
+        self.cbalance_index = BalanceIndex()
+        self.clisteners: List[Callable[[List[JournalEntry]], None]] = []
+
+    def add_listener(self, fn: Callable[[List[JournalEntry]], None]):
+        """Call fn with every batch of newly posted entries, in journal order."""
+        self.clisteners.append(fn)
 
     def create_account(self) -> str:
         """Create a new account and return its ID."""
-        cid = str(uuid.uuid4())
-        self.caccounts[cid] = Decimal("0")
-        return cid
+        return self.open_account(str(uuid.uuid4()))
+
+    def open_account(self, account_id: str) -> str:
+        """Open an account under a caller-chosen ID with zero balance (no-op if it exists)."""
+        if account_id not in self.caccounts:
+            self.caccounts[account_id] = Decimal("0")
+            self.cbalance_index.update(account_id, Decimal("0"))
+        return account_id
 
+    @timed("algobank_ledger_post", "Latency of Ledger.post in seconds.")
     def post(self, postings: List[Posting], metadata: Dict[str, str] | None = None) -> JournalEntry:
         """Post a balanced journal entry."""
         metadata = metadata or {}
-        total = sum(p.amount for p in postings)
-        if total != Decimal("0"):
-            raise ValueError("Double-entry violation: postings must sum to zero.")
+        check_balanced(postings)
 
-        # Apply changes atomically
+        # Apply changes atomically: validate every account before touching balances
         for p in postings:
             if p.account_id not in self.caccounts:
                 raise KeyError("Unknown account ID.")
-            self.caccounts[p.account_id] += p.amount
+        base = self.BASE_CURRENCY
+        for p in postings:
+            if p.currency == base:
+                self.caccounts[p.account_id] += p.amount
+            else:
+                self._add_foreign(p.account_id, p.currency, p.amount)
+        for aid in {p.account_id for p in postings if p.currency == base}:
+            self.cbalance_index.update(aid, self.caccounts[aid])
 
         je = JournalEntry(entry_id=str(uuid.uuid4()), postings=postings, metadata=metadata)
         self.centries.append(je)
+        self.centry_ids.add(je.entry_id)
+        for fn in self.clisteners:
+            fn([je])
         return je
 
-    def balance(self, account_id: str) -> Decimal:
-        """Return current balance for the given account."""
+    def post_many(self, entries: List[Tuple[str | None, List[Posting], Dict[str, str]]]) -> List[JournalEntry]:
+        """
+        Bulk path for (entry_id, postings, metadata) batches, e.g. history imports.
+        Validates the whole batch first, then applies it all-or-nothing with one
+        balance/index update per touched account instead of one per posting.
+        A None entry_id gets a fresh UUID; an entry_id already in the journal
+        (or repeated in the batch) raises ValueError.
+        """
+        deltas: Dict[Tuple[str, str], Decimal] = {}
+        batch_ids = set()
+        for eid, postings, _ in entries:
+            if eid is not None:
+                if eid in self.centry_ids or eid in batch_ids:
+                    raise ValueError(f"Duplicate entry ID: {eid}")
+                batch_ids.add(eid)
+            check_balanced(postings)
+            for p in postings:
+                if p.account_id not in self.caccounts:
+                    raise KeyError("Unknown account ID.")
+                key = (p.account_id, p.currency)
+                deltas[key] = deltas.get(key, Decimal("0")) + p.amount
+
+        for (aid, currency), delta in deltas.items():
+            if currency == self.BASE_CURRENCY:
+                self.caccounts[aid] += delta
+                self.cbalance_index.update(aid, self.caccounts[aid])
+            else:
+                self._add_foreign(aid, currency, delta)
+
+        jes = [JournalEntry(entry_id=eid or str(uuid.uuid4()), postings=postings, metadata=metadata)
+               for eid, postings, metadata in entries]
+        self.centries.extend(jes)
+        self.centry_ids.update(je.entry_id for je in jes)
+        for fn in self.clisteners:
+            fn(jes)
+        return jes
+
+    def has_entry(self, entry_id: str) -> bool:
+        return entry_id in self.centry_ids
+
+    def _add_foreign(self, account_id: str, currency: str, amount: Decimal):
+        held = self.cforeign.setdefault(account_id, {})
+        held[currency] = held.get(currency, Decimal("0")) + amount
+
+    def balance(self, account_id: str, currency: str | None = None) -> Decimal:
+        """Return current balance for the given account (base currency by default)."""
+        if account_id not in self.caccounts:
+            raise KeyError("Unknown account ID.")
+        if currency is None or currency == self.BASE_CURRENCY:
+            return self.caccounts[account_id]
+        return self.cforeign.get(account_id, {}).get(currency, Decimal("0"))
+
+    def holdings(self, account_id: str) -> Dict[str, Decimal]:
+        """Return every non-zero currency balance of the account (base currency always included)."""
         if account_id not in self.caccounts:
             raise KeyError("Unknown account ID.")
-        return self.caccounts[account_id]
+        out = {self.BASE_CURRENCY: self.caccounts[account_id]}
+        out.update((c, v) for c, v in self.cforeign.get(account_id, {}).items() if v)
+        return out
 
     def all_accounts(self) -> Dict[str, Decimal]:
         """Return snapshot of all balances."""
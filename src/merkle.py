@@ -1,5 +1,7 @@
 import hashlib
-from typing import Iterable
+from typing import Iterable, List, Tuple
+
+from src.metrics import timed
 
 def _h(data: bytes) -> bytes:
     return hashlib.sha256(data).digest()
@@ -10,10 +12,10 @@ def leaf_hash(entry_bytes: bytes) -> bytes:
 def node_hash(left: bytes, right: bytes) -> bytes:
     return _h(b"\x01" + left + right)
 
-def merkle_root(leaves: Iterable[bytes]) -> bytes:
-    layer = [leaf_hash(x) for x in leaves]
-    if not layer:
-        return _h(b"")
+def reduce_layer(layer: List[bytes]) -> Tuple[bytes, int]:
+    """Fold a non-empty layer of node hashes to one root; returns (root, levels folded)."""
+    layer = list(layer)
+    height = 0
     while len(layer) > 1:
         nxt = []
         if len(layer) % 2 == 1:
@@ -21,7 +23,36 @@ def merkle_root(leaves: Iterable[bytes]) -> bytes:
         for i in range(0, len(layer), 2):
             nxt.append(node_hash(layer[i], layer[i + 1]))
         layer = nxt
-    return layer[0]
+        height += 1
+    return layer[0], height
+
+@timed("algobank_merkle_root", "Latency of merkle_root in seconds.")
+def merkle_root(leaves: Iterable[bytes]) -> bytes:
+    layer = [leaf_hash(x) for x in leaves]
+    if not layer:
+        return _h(b"")
+    return reduce_layer(layer)[0]
+
+def subtree_root(leaves: Iterable[bytes]) -> Tuple[bytes, int]:
+    """(root, height) of one shard of leaves, for combine_subtrees."""
+    return reduce_layer([leaf_hash(x) for x in leaves])
+
+def combine_subtrees(subtrees: List[Tuple[bytes, int]]) -> bytes:
+    """
+    Merge shard roots into the root merkle_root would give for all their leaves.
+    Every shard but the last must hold the same power-of-two number of leaves;
+    the last, shorter one is lifted by the duplicate-last rule the full tree
+    would apply to it.
+    """
+    if not subtrees:
+        return _h(b"")
+    if len(subtrees) == 1:
+        return subtrees[0][0]
+    height = subtrees[0][1]
+    root, h = subtrees[-1]
+    for _ in range(height - h):
+        root = node_hash(root, root)
+    return reduce_layer([r for r, _ in subtrees[:-1]] + [root])[0]
 
 def hex_root(leaves: Iterable[bytes]) -> str:
     return merkle_root(leaves).hex()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: LabelKey, extra: LabelKey = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, help: str):
+        self.cname = name
+        self.chelp = help
+        self.cvalues: Dict[LabelKey, float] = {}
+        self.clock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.clock:
+            self.cvalues[key] = self.cvalues.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.cname} {self.chelp}", f"# TYPE {self.cname} counter"]
+        for key, val in sorted(self.cvalues.items()):
+            out.append(f"{self.cname}{_fmt_labels(key)} {val}")
+        return out
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time (no hot-path cost)."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        self.cname = name
+        self.chelp = help
+        self.cfn = fn
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.cname} {self.chelp}", f"# TYPE {self.cname} gauge",
+                f"{self.cname} {self.cfn()}"]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        self.cname = name
+        self.chelp = help
+        self.cbuckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., +Inf count, sum]
+        self.cseries: Dict[LabelKey, List[float]] = {}
+        self.clock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.clock:
+            row = self.cseries.get(key)
+            if row is None:
+                row = self.cseries[key] = [0] * (len(self.cbuckets) + 2)
+            for i, bound in enumerate(self.cbuckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            else:
+                row[-2] += 1
+            row[-1] += value
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.cname} {self.chelp}", f"# TYPE {self.cname} histogram"]
+        for key, row in sorted(self.cseries.items()):
+            acc = 0
+            for bound, n in zip(self.cbuckets, row):
+                acc += n
+                out.append(f"{self.cname}_bucket{_fmt_labels(key, (('le', repr(bound)),))} {acc}")
+            acc += row[-2]
+            out.append(f"{self.cname}_bucket{_fmt_labels(key, (('le', '+Inf'),))} {acc}")
+            out.append(f"{self.cname}_sum{_fmt_labels(key)} {row[-1]}")
+            out.append(f"{self.cname}_count{_fmt_labels(key)} {acc}")
+        return out
+
+
+class Registry:
+    """
+    Holds every metric and the global on/off switch.
+    When disabled, instrumented code pays a single attribute check per call.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.cmetrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self.cmetrics.setdefault(name, Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.cmetrics.setdefault(name, Histogram(name, help, buckets))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float]) -> Gauge:
+        self.cmetrics[name] = Gauge(name, help, fn)
+        return self.cmetrics[name]
+
+    def render(self) -> str:
+        """Export all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name in sorted(self.cmetrics):
+            lines.extend(self.cmetrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry(enabled=os.environ.get("ALGOBANK_METRICS", "1") != "0")
+
+
+def timed(name: str, help: str = ""):
+    """Decorator recording call latency into the histogram <name>_seconds."""
+    hist = REGISTRY.histogram(f"{name}_seconds", help or f"Latency of {name} in seconds.")
+
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.observe(time.perf_counter() - t0)
+        return wrapper
+    return deco
+
+
+def counted(name: str, help: str = ""):
+    """Decorator counting calls into the counter <name>_total."""
+    ctr = REGISTRY.counter(f"{name}_total", help or f"Number of {name} calls.")
+
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if REGISTRY.enabled:
+                ctr.inc()
+            return fn(*args, **kwargs)
+        return wrapper
+    return deco
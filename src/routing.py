@@ -1,6 +1,9 @@
 import heapq
 from typing import Dict, Tuple, List
 
+from src.metrics import timed
+from src.snapshot import LazyMap, Snapshot, string_sections, write_snapshot
+
 class GraphRouter:
     """
     Interbank routing system using Dijkstra's algorithm.
@@ -15,6 +18,7 @@ class GraphRouter:
         self.cgraph.setdefault(u, []).append((v, w))
         self.cgraph.setdefault(v, []).append((u, w))
 
+    @timed("algobank_routing_shortest_path", "Latency of GraphRouter.shortest_path in seconds.")
     def shortest_path(self, start: str, end: str) -> Tuple[float, List[str]]:
         """
         Compute the least-cost route between two banks.
@@ -40,4 +44,34 @@ class GraphRouter:
                 if neigh not in visited:
                     heapq.heappush(pq, (cost + wt, neigh, path))
 
-        return float("inf"), []
\ No newline at end of file
+        return float("inf"), []
+
+    def save(self, path: str):
+        """Write the graph as a CSR snapshot: node table, offsets, targets, weights."""
+        nodes = sorted(self.cgraph)
+        index = {name: i for i, name in enumerate(nodes)}
+        offsets, targets, weights = [0], [], []
+        for name in nodes:
+            for neigh, wt in self.cgraph[name]:
+                targets.append(index[neigh])
+                weights.append(wt)
+            offsets.append(len(targets))
+        write_snapshot(path, b"GRPH", string_sections(nodes) + [
+            (b"OFFS", "Q", offsets), (b"TRGT", "I", targets), (b"WGHT", "d", weights)])
+
+    @classmethod
+    def load(cls, path: str) -> "GraphRouter":
+        """Memory-map a snapshot; adjacency lists are decoded per node on first visit."""
+        snap = Snapshot(path, b"GRPH")
+        names = snap.strings()
+        offsets, targets, weights = snap.array(b"OFFS"), snap.array(b"TRGT"), snap.array(b"WGHT")
+
+        def adjacency(i):
+            lo, hi = offsets[i], offsets[i + 1]
+            # Weights are stored as doubles; give integral ones back as ints
+            return [(names[t], int(w) if w.is_integer() else w)
+                    for t, w in zip(targets[lo:hi], weights[lo:hi])]
+
+        router = cls()
+        router.cgraph = LazyMap(names, adjacency)
+        return router
\ No newline at end of file
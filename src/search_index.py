@@ -0,0 +1,111 @@
+import re
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from src.balance_index import BucketSortedList
+from src.ledger import JournalEntry, Ledger
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric tokens, e.g. 'Bill Payment - X' -> ['bill', 'payment', 'x']."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class TransactionIndex:
+    """
+    Incrementally maintained search index over ledger journal entries.
+    Entries are identified by their position (seq) in ledger.centries, so every
+    posting list is appended in ascending order and stays sorted for free:
+      - token -> seqs whose metadata 'desc' contains the token
+      - account -> seqs touching the account (doubles as the counterparty index)
+      - account -> sorted (|amount|, seq) keys for amount-range queries
+    Queries intersect the shortest list against the others by binary search,
+    so cost tracks the number of candidates, not the journal size.
+    """
+
+    def __init__(self, ledger: Ledger):
+        self.centries = ledger.centries
+        self.ctokens: Dict[str, List[int]] = {}
+        self.caccounts: Dict[str, List[int]] = {}
+        self.camounts: Dict[str, BucketSortedList] = {}
+        self.cindexed = 0
+        self.add_entries(ledger.centries)
+        ledger.add_listener(self.add_entries)
+
+    def add_entries(self, entries: List[JournalEntry]):
+        """Index entries appended to the journal since the last call."""
+        for je in entries:
+            seq = self.cindexed
+            self.cindexed += 1
+            for tok in set(tokenize(je.metadata.get("desc", ""))):
+                self.ctokens.setdefault(tok, []).append(seq)
+            seen = set()
+            for p in je.postings:
+                aid = p.account_id
+                if aid not in seen:
+                    seen.add(aid)
+                    self.caccounts.setdefault(aid, []).append(seq)
+                amounts = self.camounts.get(aid)
+                if amounts is None:
+                    amounts = self.camounts[aid] = BucketSortedList()
+                amounts.insert((abs(p.amount), seq))
+
+    def first_entry(self, account_id: str) -> Optional[int]:
+        """Seq of the earliest entry touching account_id, or None."""
+        seqs = self.caccounts.get(account_id)
+        return seqs[0] if seqs else None
+
+    def count_for(self, account_id: str) -> int:
+        """Number of entries touching account_id."""
+        return len(self.caccounts.get(account_id, ()))
+
+    def search(self, account_id: str, q: str = "", min_amount: Optional[Decimal] = None,
+               max_amount: Optional[Decimal] = None, counterparty: Optional[str] = None) -> List[int]:
+        """
+        Seqs (ascending) of entries touching account_id that contain every token of q,
+        involve counterparty, and move between min_amount and max_amount (absolute
+        value, inclusive) on account_id.
+        """
+        lists = [self.caccounts.get(account_id, [])]
+        for tok in set(tokenize(q)):
+            lists.append(self.ctokens.get(tok, []))
+        if counterparty:
+            lists.append(self.caccounts.get(counterparty, []))
+
+        if min_amount is not None or max_amount is not None:
+            amounts = self.camounts.get(account_id)
+            if amounts is None:
+                return []
+            lo = 0 if min_amount is None else amounts.bisect_left((abs(min_amount), -1))
+            hi = len(amounts) if max_amount is None else amounts.bisect_right((abs(max_amount), len(self.centries)))
+            if hi - lo < min(len(l) for l in lists):
+                # The amount range is the most selective list: materialize it
+                lists.append(sorted({seq for _, seq in amounts.slice(lo, hi)}))
+            else:
+                lists.append(None)  # checked per candidate below
+
+        driver = min((l for l in lists if l is not None), key=len)
+        others = [l for l in lists if l is not None and l is not driver]
+        out = []
+        for seq in driver:
+            if all(_contains(l, seq) for l in others) and \
+                    (None not in lists or self._amount_ok(seq, account_id, min_amount, max_amount)):
+                out.append(seq)
+        return out
+
+    def _amount_ok(self, seq, account_id, min_amount, max_amount) -> bool:
+        for p in self.centries[seq].postings:
+            if p.account_id == account_id:
+                amt = abs(p.amount)
+                if (min_amount is None or amt >= abs(min_amount)) and \
+                        (max_amount is None or amt <= abs(max_amount)):
+                    return True
+        return False
+
+
+def _contains(sorted_list: List[int], x: int) -> bool:
+    i = bisect_left(sorted_list, x)
+    return i < len(sorted_list) and sorted_list[i] == x
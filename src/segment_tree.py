@@ -1,3 +1,6 @@
+from src.snapshot import Snapshot, write_snapshot
+
+
 class SegmentTree:
     """
     Segment Tree supporting range add and point query.
@@ -37,4 +40,16 @@ class SegmentTree:
         while idx:
             res += self.clazy[idx]
             idx //= 2
-        return res
\ No newline at end of file
+        return res
+
+    def save(self, path: str):
+        """Write the lazy-add array as a snapshot (values must fit in int64)."""
+        write_snapshot(path, b"SEGT", [(b"LAZY", "q", self.clazy)])
+
+    @classmethod
+    def load(cls, path: str) -> "SegmentTree":
+        """Memory-map a snapshot; updates go to a private copy-on-write mapping."""
+        st = cls.__new__(cls)
+        st.clazy = Snapshot(path, b"SEGT").array(b"LAZY")
+        st.cn = len(st.clazy) // 2
+        return st
\ No newline at end of file
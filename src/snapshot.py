@@ -0,0 +1,215 @@
+"""
+Compact, versioned binary snapshots for the graph/DSU/segment-tree engines.
+
+Layout (little-endian):
+    header     magic "ALGOSNAP", u16 version, 4-byte kind, u16 section count
+    directory  per section: 4-byte name, 1-byte array typecode, u64 offset, u64 count
+    sections   typed arrays, each 8-byte aligned
+
+Strings are interned into one sorted table (u64 offsets + UTF-8 blob) and
+referenced by index, so a snapshot is memory-mapped and read lazily: name
+lookups binary-search the mapped table and records are decoded on first use.
+
+    python -m src.snapshot snapshots/router.snap     # show header and sections
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+MAGIC = b"ALGOSNAP"
+VERSION = 1
+_HEADER = struct.Struct("<8sH4sH")
+_SECTION = struct.Struct("<4scxxxQQ")
+
+
+def write_snapshot(path: str, kind: bytes, sections: Sequence[Tuple[bytes, str, Sequence]]):
+    """Write (name, typecode, values) sections atomically (temp file + rename)."""
+    arrays = [(name, code, values if isinstance(values, array) else array(code, values))
+              for name, code, values in sections]
+    pos = _HEADER.size + _SECTION.size * len(arrays)
+    directory, layout = [], []
+    for name, code, arr in arrays:
+        pos = (pos + 7) & ~7
+        directory.append(_SECTION.pack(name, code.encode(), pos, len(arr)))
+        layout.append((pos, arr))
+        pos += len(arr) * arr.itemsize
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, kind, len(arrays)))
+        fh.write(b"".join(directory))
+        for offset, arr in layout:
+            fh.write(b"\0" * (offset - fh.tell()))
+            arr.tofile(fh)
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    """A memory-mapped snapshot file. Arrays are copy-on-write views, never copies."""
+
+    def __init__(self, path: str, kind: bytes):
+        with open(path, "rb") as fh:
+            self.cmmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, file_kind, n = _HEADER.unpack_from(self.cmmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an AlgoBank snapshot")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported snapshot version {version}")
+        if file_kind != kind:
+            raise ValueError(f"{path}: expected a {kind.decode()} snapshot, found {file_kind.decode()}")
+        self.csections: Dict[bytes, Tuple[str, int, int]] = {}
+        for i in range(n):
+            name, code, offset, count = _SECTION.unpack_from(self.cmmap, _HEADER.size + i * _SECTION.size)
+            self.csections[name] = (code.decode(), offset, count)
+
+    def array(self, name: bytes) -> memoryview:
+        code, offset, count = self.csections[name]
+        size = array(code).itemsize
+        return memoryview(self.cmmap)[offset:offset + count * size].cast(code)
+
+    def strings(self) -> "StringTable":
+        return StringTable(self.array(b"SOFF"), self.array(b"SBLB"))
+
+
+def string_sections(strings: List[str]) -> List[Tuple[bytes, str, Sequence]]:
+    """Sections for a sorted string table (UTF-8 byte order equals code-point order)."""
+    blob = bytearray()
+    offsets = array("Q", [0])
+    for s in strings:
+        blob += s.encode()
+        offsets.append(len(blob))
+    return [(b"SOFF", "Q", offsets), (b"SBLB", "B", array("B", bytes(blob)))]
+
+
+class StringTable:
+    """Sorted interned strings in a mapped file: O(1) by index, O(log n) by value."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.coffsets = offsets
+        self.cblob = blob
+
+    def __len__(self) -> int:
+        return len(self.coffsets) - 1
+
+    def _raw(self, i: int) -> bytes:
+        return bytes(self.cblob[self.coffsets[i]:self.coffsets[i + 1]])
+
+    def __getitem__(self, i: int) -> str:
+        return self._raw(i).decode()
+
+    def index(self, s) -> int:
+        """Position of s, or -1 if absent (or not a string)."""
+        if not isinstance(s, str):
+            return -1
+        key = s.encode()
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self) and self._raw(lo) == key else -1
+
+
+class LazyMap(MutableMapping):
+    """
+    Dict-like view over a snapshot: keys come from a StringTable, values are
+    decoded by value_at(index) on first read and cached, and writes go to an
+    in-memory overlay. Engines keep using their plain dict code paths.
+    """
+
+    def __init__(self, keys: StringTable, value_at: Callable[[int], object]):
+        self.ckeys = keys
+        self.cvalue_at = value_at
+        self.coverlay: Dict[object, object] = {}
+        self.cextra = 0  # overlay keys that are not in the snapshot
+
+    def __getitem__(self, key):
+        try:
+            return self.coverlay[key]
+        except KeyError:
+            pass
+        i = self.ckeys.index(key)
+        if i < 0:
+            raise KeyError(key)
+        value = self.coverlay[key] = self.cvalue_at(i)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self.coverlay and self.ckeys.index(key) < 0:
+            self.cextra += 1
+        self.coverlay[key] = value
+
+    def __delitem__(self, key):
+        raise TypeError("snapshot-backed maps do not support deletion")
+
+    def __contains__(self, key) -> bool:
+        return key in self.coverlay or self.ckeys.index(key) >= 0
+
+    def __iter__(self) -> Iterator:
+        for i in range(len(self.ckeys)):
+            yield self.ckeys[i]
+        for key in list(self.coverlay):
+            if self.ckeys.index(key) < 0:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.ckeys) + self.cextra
+
+
+class Deferred:
+    """
+    Stand-in for an engine that is built (or loaded) on first attribute access,
+    so process startup does not depend on data size. Thread-safe.
+    """
+
+    def __init__(self, factory: Callable[[], object]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_obj", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def resolve(self):
+        obj = object.__getattribute__(self, "_obj")
+        if obj is None:
+            with object.__getattribute__(self, "_lock"):
+                obj = object.__getattribute__(self, "_obj")
+                if obj is None:
+                    obj = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_obj", obj)
+        return obj
+
+    def is_built(self) -> bool:
+        return object.__getattribute__(self, "_obj") is not None
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.resolve(), name, value)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m src.snapshot FILE", file=sys.stderr)
+        return 2
+    with open(argv[0], "rb") as fh:
+        magic, version, kind, n = _HEADER.unpack(fh.read(_HEADER.size))
+        if magic != MAGIC:
+            print(f"{argv[0]}: not an AlgoBank snapshot", file=sys.stderr)
+            return 1
+        print(f"{argv[0]}: kind={kind.decode()} version={version} sections={n}")
+        for _ in range(n):
+            name, code, offset, count = _SECTION.unpack(fh.read(_SECTION.size))
+            print(f"  {name.decode():4} {code.decode()} x {count:,} @ {offset}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Month-end statement batch job.
+
+One pass over the journal computes each account's opening balance and
+partitions the month's postings by account; CSV rendering then fans out
+to a process pool that writes straight into the output directory.
+
+    python -m src.statements 2024 1 --from history.csv --out statements/
+"""
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from src.ledger import Ledger
+
+HEADER = ["Date", "Description", "Counterparty", "Debit", "Credit", "Balance"]
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+# (date, description, counterparty, amount)
+Row = Tuple[str, str, str, Decimal]
+
+
+@dataclass
+class StatementRun:
+    statements: int
+    rows: int
+    elapsed: float
+
+    @property
+    def per_sec(self) -> float:
+        return self.statements / self.elapsed if self.elapsed else 0.0
+
+
+def entry_dates(ledger: Ledger, base: Optional[datetime] = None):
+    """
+    Yield (date, entry) for the whole journal. Entries carry an ISO 'timestamp' in
+    their metadata; those without one get the synthetic date the statement routes
+    use (two days per entry back from base, most recent last).
+    """
+    base = base or datetime.now()
+    last = len(ledger.centries) - 1
+    for seq, entry in enumerate(ledger.centries):
+        ts = entry.metadata.get("timestamp")
+        try:
+            when = datetime.fromisoformat(ts) if ts else None
+        except ValueError:
+            when = None
+        yield (when or base - timedelta(days=(last - seq) * 2)), entry
+
+
+def partition_month(ledger: Ledger, year: int, month: int, names: Dict[str, str],
+                    base: Optional[datetime] = None, currency: Optional[str] = None):
+    """Single journal pass: (opening balances, month rows per account) for one currency."""
+    currency = currency or ledger.BASE_CURRENCY
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    opening: Dict[str, Decimal] = {}
+    rows: Dict[str, List[Row]] = {}
+    for when, entry in entry_dates(ledger, base):
+        when = when.replace(tzinfo=None)
+        if when >= end:
+            continue
+        if when < start:
+            for p in entry.postings:
+                if p.currency == currency:
+                    opening[p.account_id] = opening.get(p.account_id, Decimal("0")) + p.amount
+            continue
+        day = when.strftime("%Y-%m-%d")
+        desc = entry.metadata.get("desc", "Transaction")
+        for p in entry.postings:
+            if p.currency != currency:
+                continue
+            counterparty = "External"
+            for o in entry.postings:
+                if o.account_id != p.account_id:
+                    counterparty = names.get(o.account_id, f"Account ****{o.account_id[-4:]}")
+            rows.setdefault(p.account_id, []).append((day, desc, counterparty, p.amount))
+    return opening, rows
+
+
+def statement_filename(year: int, month: int, account_id: str) -> str:
+    """
+    IDs made only of safe characters are used as-is; others are sanitised and get
+    '~' plus a hash of the raw ID ('~' is never in a sanitised name), so
+    "C/1" and "C_1" cannot overwrite each other's statement.
+    """
+    safe = _UNSAFE.sub('_', account_id)
+    if safe != account_id:
+        safe += "~" + hashlib.sha256(account_id.encode()).hexdigest()[:16]
+    return f"statement_{year}_{month:02d}_{safe}.csv"
+
+
+def _render_batch(out_dir: str, year: int, month: int,
+                  batch: List[Tuple[str, Decimal, List[Row]]]) -> int:
+    """Worker: write one CSV per account with a running balance; returns rows written."""
+    written = 0
+    for account_id, balance, rows in batch:
+        rows.sort(key=lambda r: r[0])  # stable: same-day postings keep journal order
+        path = os.path.join(out_dir, statement_filename(year, month, account_id))
+        with open(path, "w", newline="") as fh:
+            w = csv.writer(fh)
+            w.writerow(HEADER)
+            w.writerow([f"{year}-{month:02d}-01", "Opening Balance", "", "", "", balance])
+            for day, desc, counterparty, amount in rows:
+                balance += amount
+                w.writerow([day, desc, counterparty,
+                            -amount if amount < 0 else "", amount if amount > 0 else "", balance])
+        written += len(rows)
+    return written
+
+
+def generate_statements(ledger: Ledger, year: int, month: int, out_dir: str,
+                        names: Optional[Dict[str, str]] = None, workers: Optional[int] = None,
+                        batch_size: int = 1000, base: Optional[datetime] = None,
+                        currency: Optional[str] = None) -> StatementRun:
+    """
+    Write a statement CSV for every ledger account for the given month, in
+    one currency (the ledger's base currency by default).
+    workers > 1 renders batches of batch_size accounts in a process pool;
+    None means os.cpu_count().
+    """
+    t0 = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    opening, rows = partition_month(ledger, year, month, names or {}, base, currency)
+
+    jobs = [(aid, opening.get(aid, Decimal("0")), rows.get(aid, [])) for aid in ledger.caccounts]
+    batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            total_rows = sum(pool.map(_render_batch, [out_dir] * len(batches), [year] * len(batches),
+                                      [month] * len(batches), batches))
+    else:
+        total_rows = sum(_render_batch(out_dir, year, month, b) for b in batches)
+    return StatementRun(statements=len(jobs), rows=total_rows, elapsed=time.perf_counter() - t0)
+
+
+def main(argv=None):
+    from src.importer import detect_format, import_stream
+
+    ap = argparse.ArgumentParser(description="Generate month-end statements for every account")
+    ap.add_argument("year", type=int)
+    ap.add_argument("month", type=int)
+    ap.add_argument("--from", dest="source", required=True, help="CSV/NDJSON history to load (see src.importer)")
+    ap.add_argument("--out", default="statements")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    ledger = Ledger()
+    with open(args.source, newline="") as fh:
+        import_stream(ledger, fh, detect_format(args.source))
+    run = generate_statements(ledger, args.year, args.month, args.out, workers=args.workers)
+    print(f"{run.statements:,} statements ({run.rows:,} rows) in {run.elapsed:.2f}s "
+          f"-> {run.per_sec:,.0f} statements/sec")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
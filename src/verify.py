@@ -0,0 +1,189 @@
+"""
+Ledger integrity verifier.
+
+Replays the journal to recompute every (account, currency) balance and the
+Merkle root of all entries, then compares the sums with the balances the
+ledger has stored (caccounts for the base currency, cforeign otherwise).
+Anything written to those dicts without a journal entry shows up as a
+mismatch, and entries whose postings do not sum to zero are listed too.
+
+The journal is split into power-of-two shards so that each worker's Merkle
+subtree root can be merged into exactly the root merkle_root would give for
+the whole journal.
+
+    python -m src.verify --from history.csv --workers 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.ledger import JournalEntry, Ledger
+from src.merkle import combine_subtrees, subtree_root
+from src.metrics import timed
+
+# (account_id, currency) -> balance recomputed from the journal
+Sums = Dict[Tuple[str, str], Decimal]
+
+# Journal shared with forked workers, which then receive only index ranges
+_JOURNAL: Sequence[JournalEntry] = ()
+_METADATA = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+@dataclass
+class Mismatch:
+    account_id: str
+    currency: str
+    stored: Decimal
+    journal: Decimal
+
+
+@dataclass
+class UnbalancedEntry:
+    seq: int
+    entry_id: str
+    totals: Dict[str, Decimal]  # currency -> non-zero sum
+
+
+@dataclass
+class VerifyReport:
+    entries: int
+    accounts: int
+    merkle_root: str
+    mismatches: List[Mismatch] = field(default_factory=list)
+    unbalanced: List[UnbalancedEntry] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches and not self.unbalanced
+
+
+def entry_bytes(je: JournalEntry) -> bytes:
+    """Canonical Merkle leaf for a journal entry: id, postings in order, sorted metadata."""
+    parts = [je.entry_id]
+    parts.extend(f"{p.account_id}:{p.currency}:{p.amount}" for p in je.postings)
+    parts.append(_METADATA.encode(je.metadata))
+    return "|".join(parts).encode()
+
+
+def _verify_shard(lo: int, entries: Sequence[JournalEntry]):
+    """Worker: (lo, sums, unbalanced entries, (subtree root, height)) for one shard."""
+    sums: Sums = {}
+    unbalanced: List[UnbalancedEntry] = []
+    leaves = []
+    zero = Decimal("0")
+    for seq, je in enumerate(entries, lo):
+        totals: Dict[str, Decimal] = {}
+        for p in je.postings:
+            key = (p.account_id, p.currency)
+            sums[key] = sums.get(key, zero) + p.amount
+            totals[p.currency] = totals.get(p.currency, zero) + p.amount
+        if any(totals.values()):
+            unbalanced.append(UnbalancedEntry(seq, je.entry_id, {c: t for c, t in totals.items() if t}))
+        leaves.append(entry_bytes(je))
+    return lo, sums, unbalanced, subtree_root(leaves)
+
+
+def _verify_range(lo: int, hi: int):
+    return _verify_shard(lo, _JOURNAL[lo:hi])
+
+
+def shard_size_for(n: int, workers: int) -> int:
+    """Power-of-two shard size giving each worker about four shards."""
+    target = max(1, -(-n // (workers * 4)))
+    return 1 << (target - 1).bit_length()
+
+
+def stored_balances(ledger: Ledger) -> Sums:
+    out: Sums = {(aid, ledger.BASE_CURRENCY): bal for aid, bal in ledger.caccounts.items()}
+    for aid, held in ledger.cforeign.items():
+        out.update(((aid, c), bal) for c, bal in held.items())
+    return out
+
+
+@timed("algobank_verify_ledger", "Latency of a full ledger integrity check in seconds.")
+def verify_ledger(ledger: Ledger, workers: Optional[int] = None,
+                  shard_size: Optional[int] = None) -> VerifyReport:
+    """
+    Recompute balances and the journal Merkle root and compare with the ledger.
+    workers > 1 verifies shards in a process pool; None means os.cpu_count().
+    shard_size is rounded up to a power of two.
+    """
+    global _JOURNAL
+    t0 = time.perf_counter()
+    journal = ledger.centries
+    n = len(journal)
+    workers = workers or os.cpu_count() or 1
+    size = shard_size_for(n, workers) if shard_size is None else 1 << (max(shard_size, 1) - 1).bit_length()
+    los = list(range(0, n, size))
+    his = [min(lo + size, n) for lo in los]
+
+    if workers > 1 and len(los) > 1:
+        if "fork" in multiprocessing.get_all_start_methods():
+            # Forked workers inherit the journal; only index ranges are pickled
+            _JOURNAL = journal
+            try:
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context("fork")) as pool:
+                    results = list(pool.map(_verify_range, los, his))
+            finally:
+                _JOURNAL = ()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_verify_shard, los, [journal[lo:hi] for lo, hi in zip(los, his)]))
+    else:
+        results = [_verify_shard(lo, journal[lo:hi]) for lo, hi in zip(los, his)]
+
+    results.sort(key=lambda r: r[0])
+    sums: Sums = {}
+    zero = Decimal("0")
+    report = VerifyReport(entries=n, accounts=len(ledger.caccounts),
+                          merkle_root=combine_subtrees([r[3] for r in results]).hex())
+    for _, shard_sums, unbalanced, _ in results:
+        for key, amount in shard_sums.items():
+            sums[key] = sums.get(key, zero) + amount
+        report.unbalanced.extend(unbalanced)
+
+    stored = stored_balances(ledger)
+    for key in sorted(stored.keys() | sums.keys()):
+        have, want = stored.get(key, zero), sums.get(key, zero)
+        if have != want:
+            report.mismatches.append(Mismatch(key[0], key[1], stored=have, journal=want))
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def main(argv=None):
+    from src.importer import detect_format, import_stream
+
+    ap = argparse.ArgumentParser(description="Verify ledger balances against the journal")
+    ap.add_argument("--from", dest="source", required=True, help="CSV/NDJSON history to load (see src.importer)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--expect-root", default=None, help="fail unless the journal Merkle root matches")
+    args = ap.parse_args(argv)
+
+    ledger = Ledger()
+    with open(args.source, newline="") as fh:
+        import_stream(ledger, fh, detect_format(args.source))
+    report = verify_ledger(ledger, workers=args.workers)
+    for m in report.mismatches:
+        print(f"MISMATCH {m.account_id} {m.currency}: stored {m.stored}, journal {m.journal}")
+    for u in report.unbalanced:
+        print(f"UNBALANCED #{u.seq} {u.entry_id}: " + ", ".join(f"{c} {t}" for c, t in u.totals.items()))
+    print(f"{report.entries:,} entries, {report.accounts:,} accounts verified in {report.elapsed:.2f}s; "
+          f"merkle root {report.merkle_root}")
+    root_ok = args.expect_root is None or args.expect_root == report.merkle_root
+    if not root_ok:
+        print(f"Merkle root mismatch: expected {args.expect_root}")
+    return 0 if report.ok and root_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.analytics import LedgerColumns
+from src.ledger import Ledger, Posting
+
+def test_incremental_export_and_reports():
+    led = Ledger()
+    a, b, c = (led.open_account(x) for x in "abc")
+    cols = LedgerColumns(led, initial_capacity=1, chunk_size=2)
+    led.post([Posting(a, Decimal("-10")), Posting(b, Decimal("10"))],
+             {"timestamp": "2024-01-01T10:00:00", "category": "transfer"})
+    led.post([Posting(a, Decimal("-5")), Posting(c, Decimal("3")), Posting(b, Decimal("2"))],
+             {"timestamp": "2024-01-02T10:00:00"})
+    assert cols.sync() == 5 and cols.sync() == 0
+    led.post([Posting(b, Decimal("-1")), Posting(a, Decimal("1"))],
+             {"timestamp": "2024-01-02T11:00:00", "category": "transfer"})
+    led.post([Posting(a, Decimal("-7"), "USD"), Posting(b, Decimal("7"), "USD")])
+    d = led.open_account("d")
+    led.post([Posting(a, Decimal("-6"), "GBP"), Posting(b, Decimal("-2"), "GBP"),
+              Posting(c, Decimal("4"), "GBP"), Posting(d, Decimal("4"), "GBP")])
+
+    assert cols.daily() == [
+        {"date": "2024-01-01", "volume": 10.0, "entries": 1, "postings": 2},
+        {"date": "2024-01-02", "volume": 6.0, "entries": 2, "postings": 5},
+    ]
+    assert cols.daily(start=date(2024, 1, 2), end=date(2024, 1, 2))[0]["entries"] == 2
+    assert [(r["account_id"], r["net"]) for r in cols.net_flows()] == [("a", -14.0), ("b", 11.0), ("c", 3.0)]
+    assert [(r["from"], r["to"], r["volume"]) for r in cols.top_pairs(limit=2)] == [("a", "b", 12.0), ("a", "c", 3.0)]
+    assert cols.top_pairs("USD") == [{"from": "a", "to": "b", "volume": 7.0, "count": 1}]
+    assert sorted((r["from"], r["to"], r["volume"]) for r in cols.top_pairs("GBP")) == [
+        ("a", "c", 3.0), ("a", "d", 3.0), ("b", "c", 1.0), ("b", "d", 1.0)]
+    assert [(r["category"], r["entries"]) for r in cols.categories()] == [("transfer", 2), ("uncategorized", 1)]
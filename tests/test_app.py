@@ -0,0 +1,116 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import app as webapp
+
+ADMIN = {"X-Admin-Token": "test-token"}
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(webapp.app.config, "ADMIN_TOKEN", "test-token")
+    c = webapp.app.test_client()
+    c.post("/login", data={"username": "tester", "password": "pw"})
+    return c
+
+def test_operator_gate_on_accounts(client):
+    assert webapp.app.test_client().get("/api/accounts").status_code == 401
+    assert client.get("/api/accounts").status_code == 403
+    assert client.get("/api/accounts", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/api/accounts", headers=ADMIN).status_code == 200
+
+@pytest.mark.parametrize("query", ["min=NaN", "max=sNaN", "cursor=NaN:x", "min=abc", "limit=x"])
+def test_accounts_rejects_bad_parameters(client, query):
+    assert client.get(f"/api/accounts?{query}", headers=ADMIN).status_code == 400
+
+@pytest.mark.parametrize("body", [{"amount": "abc"}, {"amount": "1e400"}, {"amount": None},
+                                  {"amount": 100, "atm_id": ["ATM-001"]}])
+def test_atm_rejects_bad_input(client, body):
+    assert client.post("/api/atm", json=body).status_code == 400
+
+def test_import_is_gated_scoped_and_idempotent(client):
+    me = webapp.demo_accounts["user_tester"]
+    victim = webapp.demo_accounts["account_1"]
+    body = (f"entry_id,account_id,amount,currency\nimp-1,{me},-5,EUR\nimp-1,IMP-NEW,5,EUR\n"
+            f"imp-2,{victim},-5,EUR\nimp-2,{me},5,EUR\nimp-3,{me},-5,XYZ\nimp-3,IMP-NEW,5,XYZ\n").encode()
+    assert client.post("/api/import?format=csv", data=body).status_code == 403
+    stats = client.post("/api/import?format=csv", data=body, headers=ADMIN).get_json()
+    assert stats["entries_imported"] == 1
+    assert {r["reason"] for r in stats["rejects"]} == {f"Account not permitted: {victim}", "Unsupported currency: XYZ"}
+    assert "IMP-NEW" in webapp.fraud_detector.cpar
+    assert client.post("/api/import?format=csv", data=body, headers=ADMIN).get_json()["entries_imported"] == 0
+
+def test_import_reports_partial_stats_on_unreadable_input(client):
+    me = webapp.demo_accounts["user_tester"]
+    body = (f"entry_id,account_id,amount\nbig-1,{me},-1\nbig-1,BIG-NEW,1\nbig-2,{me},-1\nbig-2,BIG-NEW,1\n"
+            f"big-3,{me},\"{'x' * 200_000}\"\n")
+    resp = client.post("/api/import?format=csv&chunk_size=1", data=body.encode(), headers=ADMIN)
+    assert resp.status_code == 400
+    assert resp.get_json()["entries_imported"] == 1 and "error" in resp.get_json()
+    assert "BIG-NEW" in webapp.fraud_detector.cpar
+    assert client.post("/api/import?format=csv", data=b"\xff\xfe", headers=ADMIN).status_code == 400
+
+@pytest.mark.parametrize("query", ["min=NaN", "max=sNaN", "min=Infinity", "max=abc"])
+def test_transactions_rejects_bad_amount_filters(client, query):
+    assert client.get(f"/api/transactions?{query}").status_code == 400
+    assert client.get("/api/transactions?min=1&q=deposit").status_code == 200
+
+def test_fx_revaluation_hides_bank_figures_and_survives_unrated_currencies(client):
+    assert webapp.app.test_client().get("/api/fx/revaluation").status_code == 401
+    a, b = webapp.ledger.open_account("FX-A"), webapp.ledger.open_account("FX-B")
+    webapp.ledger.post([webapp.Posting(a, webapp.Decimal("-3"), "XYZ"), webapp.Posting(b, webapp.Decimal("3"), "XYZ")])
+    mine = client.get("/api/fx/revaluation").get_json()
+    assert "bank_total" not in mine and "exposure" not in mine
+    assert client.get("/api/fx/revaluation?currency=XYZ").status_code == 400
+    resp = client.get("/api/fx/revaluation?currency=USD", headers=ADMIN)
+    assert resp.status_code == 200 and "XYZ" in resp.get_json()["unrated"]
+
+def test_statement_is_per_currency(client):
+    me = webapp.demo_accounts["user_tester"]
+    other = webapp.demo_accounts["account_1"]
+    webapp.ledger.post([webapp.Posting(other, webapp.Decimal("-9"), "USD"), webapp.Posting(me, webapp.Decimal("9"), "USD")],
+                       metadata={"desc": "usd-in"})
+    eur = client.post("/api/statement", json={}).get_json()["transactions"]
+    usd = client.post("/api/statement", json={"currency": "USD"}).get_json()["transactions"]
+    assert "usd-in" not in {t["description"] for t in eur}
+    assert [t["credit"] for t in usd if t["description"] == "usd-in"] == ["9"]
+    assert client.post("/api/statement", json={"currency": "XYZ"}).status_code == 400
+    assert b"usd-in" in client.get("/api/statement/download?currency=USD").data
+
+def test_snapshots_capture_the_running_process(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(webapp, "SNAPSHOT_DIR", str(tmp_path))
+    assert client.post("/api/admin/snapshots").status_code == 403
+    assert client.post("/api/admin/snapshots", headers=ADMIN).status_code == 200
+    saved = webapp.DSU.load(str(tmp_path / "fraud.snap"))
+    assert webapp.demo_accounts["user_tester"] in saved.cpar
+    assert {p.name for p in tmp_path.iterdir()} == {"router.snap", "fraud.snap", "interest.snap"}
+
+def test_analytics_is_operator_only(client):
+    assert webapp.app.test_client().get("/api/analytics/flows").status_code == 401
+    assert client.get("/api/analytics/flows").status_code == 403
+    assert client.get("/api/analytics/flows", headers=ADMIN).status_code == 200
+    assert client.get("/api/analytics/nope", headers=ADMIN).status_code == 404
+    assert client.get("/api/analytics/daily?from=yesterday", headers=ADMIN).status_code == 400
+
+def test_verify_checks_the_live_ledger(client, monkeypatch):
+    assert client.get("/api/admin/verify").status_code == 403
+    report = client.get("/api/admin/verify", headers=ADMIN).get_json()
+    assert report["ok"] and report["entries"] == len(webapp.ledger.centries)
+    me = webapp.demo_accounts["user_tester"]
+    monkeypatch.setitem(webapp.ledger.caccounts, me, webapp.ledger.caccounts[me] + 1)
+    report = client.get("/api/admin/verify", headers=ADMIN).get_json()
+    assert not report["ok"] and [m["account_id"] for m in report["mismatches"]] == [me]
+
+def test_metrics_endpoint(client, monkeypatch):
+    resp = webapp.app.test_client().get("/metrics")
+    assert resp.status_code == 200 and b"algobank_" in resp.data
+    monkeypatch.setattr(webapp.metrics, "enabled", False)
+    assert client.get("/metrics").status_code == 404
+
+def test_events_stream_needs_a_session_and_resets_unknown_ids(client):
+    assert webapp.app.test_client().get("/api/events").status_code == 401
+    resp = client.get("/api/events?last_event_id=bogus")
+    frames = iter(resp.response)
+    assert next(frames).startswith(b"retry:") and b"event: reset" in next(frames)
+    resp.close()
+    assert webapp.demo_accounts["user_tester"] not in webapp.events.csubs
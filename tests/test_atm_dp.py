@@ -1,4 +1,43 @@
-from src.atm_dp import min_notes
+import random
+
+import pytest
+
+from src import atm_dp
+from src.atm_dp import min_notes, min_notes_fast, plan_notes
 
 def test_min_notes_basic():
-    assert min_notes(700, [500, 200, 100], [1, 5, 5]) == 2  # 500 + 200
\ No newline at end of file
+    assert min_notes(700, [500, 200, 100], [1, 5, 5]) == 2  # 500 + 200
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_min_notes_fast_matches_min_notes(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(atm_dp, "np", None)
+    rng = random.Random(26)
+    for _ in range(300):
+        notes = rng.sample([1, 2, 3, 5, 7, 10, 20, 50, 100, 200, 500], rng.randint(1, 5))
+        scale = rng.choice([1, 1, 10])
+        notes = [d * scale for d in notes]
+        counts = [rng.randint(0, 12) for _ in notes]
+        amount = rng.randint(0, 1500) * rng.choice([1, scale])
+        assert min_notes_fast(amount, notes, counts) == min_notes(amount, notes, counts)
+
+def test_min_notes_fast_table_ceiling():
+    with pytest.raises(ValueError):
+        min_notes_fast(10**6, [7, 3], [10**5, 10**5], max_cells=1000)
+
+def test_plan_notes_is_optimal_and_feasible():
+    rng = random.Random(27)
+    notes = [500, 200, 100, 50, 20, 10]
+    for _ in range(200):
+        counts = [rng.randint(0, 6) for _ in notes]
+        amount = rng.randint(0, 300) * 10
+        plan = plan_notes(amount, notes, counts)
+        best = min_notes(amount, notes, counts)
+        if best == -1:
+            assert plan is None
+        else:
+            assert sum(d * k for d, k in zip(notes, plan)) == amount
+            assert all(0 <= k <= c for k, c in zip(plan, counts))
+            assert sum(plan) == best
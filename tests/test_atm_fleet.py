@@ -0,0 +1,21 @@
+from src.atm_fleet import ATMFleet
+
+def test_fleet_replay_updates_inventory():
+    fleet = ATMFleet([100, 50, 20])
+    fleet.add_atm("A", [1, 1, 5])
+    fleet.add_atm("B", [0, 0, 2])
+    results = fleet.replay([("A", 150), ("B", 40), ("A", 150), ("A", 60), ("B", 20)], workers=1)
+    assert results == [[1, 1, 0], [0, 0, 2], None, [0, 0, 3], None]
+    assert fleet.inventory("A") == {100: 0, 50: 0, 20: 2}
+    assert fleet.inventory("B") == {100: 0, 50: 0, 20: 0}
+
+def test_fleet_replay_parallel_matches_serial():
+    stream = [(f"ATM{i % 7}", 20 * (i % 13 + 1)) for i in range(300)]
+    fleets = []
+    for _ in range(2):
+        fleet = ATMFleet()
+        for i in range(7):
+            fleet.add_atm(f"ATM{i}", [3, 5, 8, 10, 15, 20])
+        fleets.append(fleet)
+    assert fleets[0].replay(stream, workers=1) == fleets[1].replay(stream, workers=2)
+    assert fleets[0].cinventory == fleets[1].cinventory
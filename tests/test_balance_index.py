@@ -0,0 +1,39 @@
+import random
+from decimal import Decimal
+
+from src.balance_index import BalanceIndex, BucketSortedList
+from src.ledger import Ledger, Posting
+
+def test_sorted_list_matches_reference():
+    rng = random.Random(30)
+    sl, ref = BucketSortedList(), []
+    sl.LOAD = 8  # force plenty of bucket splits
+    for _ in range(2000):
+        if ref and rng.random() < 0.4:
+            key = rng.choice(ref)
+            ref.remove(key)
+            sl.remove(key)
+        else:
+            key = rng.randint(0, 300)
+            ref.append(key)
+            sl.insert(key)
+    ref.sort()
+    assert len(sl) == len(ref)
+    assert sl.slice(0, len(ref)) == ref
+    assert [sl[i] for i in range(0, len(ref), 37)] == ref[::37]
+    for probe in (-1, 0, 150, 301):
+        assert sl.bisect_left(probe) == sum(k < probe for k in ref)
+        assert sl.bisect_right(probe) == sum(k <= probe for k in ref)
+
+def test_ledger_keeps_balance_index_current():
+    led = Ledger()
+    a, b, c = (led.open_account(x) for x in "abc")
+    led.post([Posting(a, Decimal("-100")), Posting(b, Decimal("70")), Posting(c, Decimal("30"))])
+    idx = led.cbalance_index
+    assert idx.top(2) == [("b", Decimal("70")), ("c", Decimal("30"))]
+    assert idx.bottom(1) == [("a", Decimal("-100"))]
+    assert idx.rank("c") == 1
+    assert idx.balance_range(Decimal("0"), Decimal("70")) == [("c", Decimal("30")), ("b", Decimal("70"))]
+    first = idx.page(2)
+    assert first == [("b", Decimal("70")), ("c", Decimal("30"))]
+    assert idx.page(2, after=(Decimal("30"), "c")) == [("a", Decimal("-100"))]
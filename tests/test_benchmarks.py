@@ -0,0 +1,13 @@
+from benchmarks.compare import compare
+from benchmarks.run import parse_scale
+
+def test_parse_scale():
+    assert parse_scale("1k") == 1_000
+    assert parse_scale("1M") == 1_000_000
+    assert parse_scale("250") == 250
+
+def test_compare_flags_regressions():
+    base = {("a", 1): {"ops_per_sec": 100, "p99_us": 10}, ("b", 1): {"ops_per_sec": 100, "p99_us": 10}}
+    new = {("a", 1): {"ops_per_sec": 95, "p99_us": 10.5}, ("b", 1): {"ops_per_sec": 70, "p99_us": 10}}
+    _, regressions = compare(base, new, 0.10)
+    assert regressions == [("b", 1)]
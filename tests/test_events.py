@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from src.events import EventBroker
+from src.ledger import Ledger, Posting
+
+def _pay(led, a, b, amt):
+    led.post([Posting(a, -Decimal(amt)), Posting(b, Decimal(amt))], metadata={"desc": "Transfer"})
+
+def _drain(sub):
+    frames = []
+    while (f := sub.get(timeout=0)) is not None:
+        frames.append(f)
+    return frames
+
+def test_broker_pushes_to_subscribed_account_only():
+    led = Ledger()
+    a, b, c = (led.open_account(x) for x in "abc")
+    broker = EventBroker(led, names={"b": "Bob"})
+    sub = broker.subscribe("a")
+    _pay(led, a, b, "10")
+    _pay(led, b, c, "5")
+    frames = _drain(sub)
+    assert [f.split("\n")[1] for f in frames] == ["event: posting", "event: balance"]
+    assert '"counterparty": "Bob"' in frames[0] and '"balance": "-10"' in frames[1]
+    assert "c" not in broker.crecent  # never subscribed, so nothing recorded
+
+def test_broker_resumes_from_last_event_id():
+    led = Ledger()
+    a, b = led.open_account("a"), led.open_account("b")
+    broker = EventBroker(led, history=4)
+    sub = broker.subscribe("a")
+    _pay(led, a, b, "1")
+    last_id = _drain(sub)[-1].split("\n")[0][len("id: "):]
+    broker.unsubscribe(sub)
+    _pay(led, a, b, "2")
+    resumed = _drain(broker.subscribe("a", last_id))
+    assert len(resumed) == 2 and '"balance": "-3"' in resumed[1]
+    for _ in range(3):
+        _pay(led, a, b, "1")
+    assert "event: reset" in _drain(broker.subscribe("a", last_id))[0]
+
+def test_broker_drops_history_after_grace_period():
+    led = Ledger()
+    a, b = led.open_account("a"), led.open_account("b")
+    broker = EventBroker(led, grace=0)
+    sub = broker.subscribe("a")
+    _pay(led, a, b, "1")
+    last_id = _drain(sub)[-1].split("\n")[0][len("id: "):]
+    broker.unsubscribe(sub)
+    assert "a" not in broker.crecent and not broker.cidle
+    _pay(led, a, b, "2")
+    assert "a" not in broker.crecent  # no longer encoded for anyone
+    assert "event: reset" in _drain(broker.subscribe("a", last_id))[0]
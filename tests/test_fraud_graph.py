@@ -7,4 +7,13 @@ def test_dsu_basic():
     dsu.add("C")
     dsu.union("A", "B")
     assert dsu.connected("A", "B") is True
-    assert dsu.connected("A", "C") is False
\ No newline at end of file
+    assert dsu.connected("A", "C") is False
+
+def test_dsu_cluster_count():
+    dsu = DSU()
+    for x in "ABCD":
+        dsu.add(x)
+    dsu.union("A", "B")
+    dsu.union("B", "A")
+    dsu.union("C", "D")
+    assert dsu.cluster_count() == 2
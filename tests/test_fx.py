@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.fx import FXBook, RateTable
+from src.ledger import Ledger, Posting
+
+def test_cross_rates_and_revaluation():
+    rates = RateTable("EUR", {"USD": Decimal("1.25"), "GBP": Decimal("0.5")})
+    assert rates.rate("USD", "GBP") == Decimal("0.4")
+    led = Ledger()
+    a, b = led.open_account("a"), led.open_account("b")
+    led.post([Posting(a, Decimal("-10")), Posting(b, Decimal("10"))])
+    book = FXBook(led, initial_capacity=1)  # seeded from existing balances, then grows
+    led.post([Posting(a, Decimal("-5"), "GBP"), Posting(b, Decimal("5"), "GBP")])
+    led.post([Posting(a, Decimal("-25"), "USD"), Posting(b, Decimal("25"), "USD")])
+    totals = dict(zip(book.caccount_ids, book.revalue(rates, "EUR", batch_size=1)))
+    assert totals["b"] == pytest.approx(10 + 5 / 0.5 + 25 / 1.25)
+    assert totals["a"] == pytest.approx(-totals["b"])
+    assert book.exposure() == {"EUR": 0.0, "GBP": 0.0, "USD": 0.0}
+
+def test_unrated_currencies_are_left_out_of_revaluation():
+    rates = RateTable("EUR", {"USD": Decimal("2")})
+    led = Ledger()
+    a, b = led.open_account("a"), led.open_account("b")
+    led.post([Posting(a, Decimal("-4"), "USD"), Posting(b, Decimal("4"), "USD")])
+    led.post([Posting(a, Decimal("-7"), "XYZ"), Posting(b, Decimal("7"), "XYZ")])
+    book = FXBook(led)
+    assert book.unrated(rates) == ["XYZ"]
+    assert book.account_total(rates, "EUR", "b") == pytest.approx(2.0)
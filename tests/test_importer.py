@@ -0,0 +1,61 @@
+import io
+from decimal import Decimal
+
+from src.importer import import_stream
+from src.ledger import Ledger
+
+CSV = """entry_id,account_id,amount,currency,desc,timestamp
+t1,A,-25.00,EUR,Coffee,2024-01-02T08:00:00
+t1,B,25.00,EUR,Coffee,2024-01-02T08:00:00
+t2,A,-10,EUR,Broken,
+t2,B,9,EUR,Broken,
+t3,B,-5,EUR,Refund,
+t3,C,abc,EUR,Refund,
+t4,C,-1,EUR,Fee,
+t4,A,1,EUR,Fee,
+"""
+
+def test_import_csv_applies_balanced_entries_and_rejects_rows():
+    led = Ledger()
+    progress = []
+    stats = import_stream(led, io.StringIO(CSV), "csv", chunk_size=2, progress=lambda s: progress.append(s.chunks))
+    assert stats.rows_read == 8
+    assert stats.entries_imported == 2 and stats.rows_imported == 4
+    assert stats.rows_rejected == 4
+    assert [r["line"] for r in stats.rejects] == [4, 5, 6, 7]
+    assert stats.accounts_created == 3
+    assert progress == [1, 2]
+    assert led.balance("A") == Decimal("-24") and led.balance("B") == Decimal("25")
+    assert led.centries[0].entry_id == "t1" and led.centries[0].metadata["desc"] == "Coffee"
+
+def test_import_ndjson():
+    led = Ledger()
+    data = ('{"entry_id": "x", "account_id": "A", "amount": "-3"}\n'
+            '{"entry_id": "x", "account_id": "B", "amount": 3}\n'
+            'not json\n')
+    stats = import_stream(led, io.StringIO(data), "ndjson")
+    assert stats.rows_rejected == 1 and stats.rejects[0]["line"] == 3
+    assert led.balance("B") == Decimal("3")
+
+def test_import_skips_known_entry_ids_and_refused_accounts():
+    led = Ledger()
+    led.open_account("VICTIM")
+    data = ("entry_id,account_id,amount,currency\nx1,ME,-100,EUR\nx1,NEW,100,EUR\n"
+            "x2,VICTIM,-100,EUR\nx2,ME,100,EUR\nx3,ME,-1,eur\nx3,NEW,1,eur\n")
+    opened = []
+    stats = import_stream(led, io.StringIO(data), "csv", allow_account=lambda a: a != "VICTIM",
+                          allow_currency=lambda c: c == "EUR", on_open=opened.extend)
+    assert stats.entries_imported == 1 and opened == ["ME", "NEW"]
+    assert [r["reason"] for r in stats.rejects] == ["Account not permitted: VICTIM"] * 2 + ["Unsupported currency: eur"] * 2
+
+    again = import_stream(led, io.StringIO(data), "csv", allow_account=lambda a: a != "VICTIM",
+                          allow_currency=lambda c: c == "EUR")
+    assert again.entries_imported == 0 and again.rejects[0]["reason"] == "Duplicate entry ID: x1"
+    assert led.balance("NEW") == Decimal("100") and led.balance("VICTIM") == Decimal("0")
+
+def test_unreadable_csv_stops_import_and_keeps_applied_chunks():
+    led = Ledger()
+    data = "entry_id,account_id,amount\nt1,A,-1\nt1,B,1\nt2,A,-1\nt2,B,1\nt3,A,\"" + "x" * 200_000 + "\"\n"
+    stats = import_stream(led, io.StringIO(data), "csv", chunk_size=2)
+    assert stats.error and stats.as_dict()["error"] == stats.error
+    assert stats.entries_imported == 1 and stats.rows_imported == 2 and led.balance("B") == Decimal("1")
@@ -1,3 +1,4 @@
+import pytest
 from src.ledger import Ledger, Posting
 from decimal import Decimal
 
@@ -9,4 +10,15 @@ def test_post_balanced():
         Posting(a2, Decimal("100"))
     ])
     assert led.balance(a1) == Decimal("-100")
-    assert led.balance(a2) == Decimal("100")
\ No newline at end of file
+    assert led.balance(a2) == Decimal("100")
+
+def test_post_checks_double_entry_per_currency():
+    led = Ledger()
+    a1, a2 = led.create_account(), led.create_account()
+    with pytest.raises(ValueError):
+        # Sums to zero overall, but not within each currency
+        led.post([Posting(a1, Decimal("-100"), "EUR"), Posting(a2, Decimal("100"), "USD")])
+    led.post([Posting(a1, Decimal("-30"), "USD"), Posting(a2, Decimal("30"), "USD")])
+    assert led.balance(a1) == Decimal("0")
+    assert led.balance(a1, "USD") == Decimal("-30")
+    assert led.holdings(a2) == {"EUR": Decimal("0"), "USD": Decimal("30")}
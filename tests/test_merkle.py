@@ -1,6 +1,13 @@
-from src.merkle import hex_root
+from src.merkle import combine_subtrees, hex_root, merkle_root, subtree_root
 
 def test_merkle_basic():
     h = hex_root([b"txn1", b"txn2", b"txn3"])
     assert isinstance(h, str)
-    assert len(h) == 64
\ No newline at end of file
+    assert len(h) == 64
+
+def test_combined_shard_roots_match_full_tree():
+    for n in (1, 2, 5, 8, 13):
+        leaves = [str(i).encode() for i in range(n)]
+        for size in (1, 2, 4):
+            shards = [subtree_root(leaves[i:i + size]) for i in range(0, n, size)]
+            assert combine_subtrees(shards) == merkle_root(leaves)
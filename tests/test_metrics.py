@@ -0,0 +1,27 @@
+from src.metrics import REGISTRY, Registry, timed, counted
+
+def test_registry_renders_prometheus_text():
+    reg = Registry()
+    reg.counter("jobs_total", "Jobs run.").inc(2, kind="a")
+    reg.histogram("lat_seconds", "Latency.", buckets=(0.1, 1.0)).observe(0.5, route="/x")
+    reg.gauge("queue_depth", "Depth.", lambda: 7)
+    text = reg.render()
+    assert 'jobs_total{kind="a"} 2' in text
+    assert 'lat_seconds_bucket{route="/x",le="0.1"} 0' in text
+    assert 'lat_seconds_bucket{route="/x",le="1.0"} 1' in text
+    assert 'lat_seconds_count{route="/x"} 1' in text
+    assert "# TYPE queue_depth gauge\nqueue_depth 7" in text
+
+def test_decorators_record_only_when_enabled(monkeypatch):
+    @timed("test_fn")
+    @counted("test_fn")
+    def fn(x):
+        return x * 2
+
+    monkeypatch.setattr(REGISTRY, "enabled", False)
+    assert fn(2) == 4
+    assert REGISTRY.cmetrics["test_fn_total"].cvalues == {}
+    monkeypatch.setattr(REGISTRY, "enabled", True)
+    fn(3)
+    assert REGISTRY.cmetrics["test_fn_total"].cvalues[()] == 1
+    assert REGISTRY.cmetrics["test_fn_seconds"].cseries[()][-1] >= 0
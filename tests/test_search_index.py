@@ -0,0 +1,35 @@
+import random
+from decimal import Decimal
+
+from src.ledger import Ledger, Posting
+from src.search_index import TransactionIndex
+
+def test_search_matches_brute_force_scan():
+    rng = random.Random(32)
+    led = Ledger()
+    accounts = [led.open_account(f"acc{i}") for i in range(6)]
+    idx = TransactionIndex(led)
+    billers = ["Electricity", "Water", "Internet"]
+    for _ in range(400):
+        a, b = rng.sample(accounts, 2)
+        amt = Decimal(rng.randint(1, 1000))
+        desc = f"Bill Payment - {rng.choice(billers)}" if rng.random() < 0.5 else "Transfer"
+        led.post([Posting(a, -amt), Posting(b, amt)], metadata={"desc": desc})
+
+    def scan(acc, q, lo, hi, cp):
+        out = []
+        for seq, je in enumerate(led.centries):
+            mine = [p for p in je.postings if p.account_id == acc]
+            if not mine or (cp and all(p.account_id != cp for p in je.postings)):
+                continue
+            if q and not all(t in je.metadata["desc"].lower().split() for t in q.lower().split()):
+                continue
+            if any((lo is None or abs(p.amount) >= lo) and (hi is None or abs(p.amount) <= hi) for p in mine):
+                out.append(seq)
+        return out
+
+    for q, lo, hi, cp in [("", None, None, None), ("bill water", None, None, None),
+                          ("bill", Decimal(500), None, None), ("", Decimal(100), Decimal(120), "acc3"),
+                          ("transfer", None, Decimal(10), None), ("nothing", None, None, None)]:
+        assert idx.search("acc0", q, lo, hi, cp) == scan("acc0", q, lo, hi, cp)
+    assert idx.count_for("acc1") == len(scan("acc1", "", None, None, None))
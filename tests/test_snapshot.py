@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from src.fraud_graph import DSU
+from src.routing import GraphRouter
+from src.segment_tree import SegmentTree
+from src.snapshot import Deferred
+
+def test_router_snapshot_roundtrip(tmp_path):
+    rng = random.Random(36)
+    gr = GraphRouter()
+    for _ in range(200):
+        gr.add_edge(f"Bank{rng.randrange(60)}", f"Bänk{rng.randrange(60)}", rng.randint(1, 9))
+    gr.save(tmp_path / "router.snap")
+    loaded = GraphRouter.load(tmp_path / "router.snap")
+    for _ in range(30):
+        a, b = rng.choice(list(gr.cgraph)), rng.choice(list(gr.cgraph))
+        assert loaded.shortest_path(a, b) == gr.shortest_path(a, b)
+    assert loaded.shortest_path("Bank0", "Nowhere") == (float("inf"), [])
+    loaded.add_edge("Bank0", "Nowhere", 1)  # loaded graphs stay mutable
+    assert loaded.shortest_path("Bank0", "Nowhere")[1] == ["Bank0", "Nowhere"]
+
+def test_dsu_and_segment_tree_snapshot_roundtrip(tmp_path):
+    dsu = DSU()
+    for x in "ABCDE":
+        dsu.add(x)
+    dsu.union("A", "B")
+    dsu.union("C", "D")
+    dsu.save(tmp_path / "dsu.snap")
+    loaded = DSU.load(tmp_path / "dsu.snap")
+    assert loaded.connected("A", "B") and not loaded.connected("A", "C")
+    assert loaded.cluster_count() == 3
+    loaded.add("F")
+    loaded.union("E", "A")
+    assert loaded.connected("B", "E") and loaded.cluster_count() == 3 and len(loaded.cpar) == 6
+
+    st = SegmentTree(10)
+    st.range_add(0, 9, 1)
+    st.range_add(2, 4, 2)
+    st.save(tmp_path / "st.snap")
+    st2 = SegmentTree.load(tmp_path / "st.snap")
+    st2.range_add(3, 3, 5)
+    assert [st2.point_query(i) for i in (1, 3, 8)] == [1, 8, 1]
+    assert SegmentTree.load(tmp_path / "st.snap").point_query(3) == 3  # file untouched
+    with pytest.raises(ValueError):
+        DSU.load(tmp_path / "st.snap")
+
+def test_deferred_builds_on_first_use():
+    calls = []
+    lazy = Deferred(lambda: calls.append(1) or DSU())
+    assert not lazy.is_built() and calls == []
+    lazy.add("A")
+    assert lazy.connected("A", "A") and calls == [1]
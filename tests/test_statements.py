@@ -0,0 +1,25 @@
+import csv
+from decimal import Decimal
+
+from src.ledger import Ledger, Posting
+from src.statements import generate_statements, statement_filename
+
+def test_generate_statements_partitions_month(tmp_path):
+    led = Ledger()
+    a, b, c, _ = (led.open_account(x) for x in ("A", "B", "C/1", "C_1"))
+    for ts, amt in [("2024-01-20T10:00:00", "100"), ("2024-02-03T09:00:00", "30"),
+                    ("2024-02-01T09:00:00", "5"), ("2024-03-01T00:00:00", "1")]:
+        led.post([Posting(a, -Decimal(amt)), Posting(b, Decimal(amt))], {"desc": "Transfer", "timestamp": ts})
+
+    for workers in (1, 2):
+        out = tmp_path / f"w{workers}"
+        run = generate_statements(led, 2024, 2, str(out), names={"B": "Bob"}, workers=workers, batch_size=1)
+        assert run.statements == 4 and run.rows == 4
+        with open(out / statement_filename(2024, 2, "A"), newline="") as fh:
+            rows = list(csv.reader(fh))
+        assert rows[1][1] == "Opening Balance" and rows[1][5] == "-100"
+        assert [r[0] for r in rows[2:]] == ["2024-02-01", "2024-02-03"]
+        assert rows[2][2] == "Bob" and rows[2][3] == "5" and rows[-1][5] == "-135"
+        assert (out / "statement_2024_02_C_1.csv").exists()
+        assert (out / statement_filename(2024, 2, "C/1")).exists()
+        assert len(list(out.iterdir())) == 4
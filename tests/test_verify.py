@@ -0,0 +1,27 @@
+from decimal import Decimal
+
+from src.ledger import JournalEntry, Ledger, Posting
+from src.merkle import hex_root
+from src.verify import entry_bytes, verify_ledger
+
+def test_verify_reports_drift_and_unbalanced_entries():
+    led = Ledger()
+    a, b = led.open_account("a"), led.open_account("b")
+    for i in range(1, 10):
+        led.post([Posting(a, -Decimal(i)), Posting(b, Decimal(i))])
+    led.post([Posting(a, Decimal("-2"), "USD"), Posting(b, Decimal("2"), "USD")])
+    assert verify_ledger(led, workers=1).ok
+
+    led.caccounts["c"] = Decimal("50000")  # written without a journal entry
+    led.cforeign[b]["USD"] = Decimal("0")
+    led.centries.append(JournalEntry("bad", [Posting(a, Decimal("1"))], {}))
+    root = hex_root(entry_bytes(je) for je in led.centries)
+    for workers in (1, 2):
+        report = verify_ledger(led, workers=workers, shard_size=4)
+        assert not report.ok and report.merkle_root == root
+        assert [(m.account_id, m.currency, m.stored, m.journal) for m in report.mismatches] == [
+            ("a", "EUR", Decimal("-45"), Decimal("-44")),
+            ("b", "USD", Decimal("0"), Decimal("2")),
+            ("c", "EUR", Decimal("50000"), Decimal("0")),
+        ]
+        assert [(u.seq, u.totals) for u in report.unbalanced] == [(10, {"EUR": Decimal("1")})]